@@ -0,0 +1,117 @@
+import os, time, argparse, multiprocessing
+
+# plays lots of headless Line Ball episodes with the scripted AutoPlacer over a process pool and
+# prints the survival height distribution for each difficulty setting
+#   python batch_sim.py --episodes 2000
+#   python batch_sim.py --episodes 1000 --set gravity=0.06 --set laser_score=150,laser_odds=200
+#   python batch_sim.py --episodes 400 --scaling        (1, 2, 4 ... workers on the default setting)
+
+def init_worker():
+    os.environ['SDL_VIDEODRIVER'] = 'dummy'
+    os.environ['SDL_AUDIODRIVER'] = 'dummy'
+    import pygame
+    from data.game import SCREEN_SIZE, load_assets
+    pygame.display.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    load_assets()
+
+# one episode, from the first step until the ball leaves the screen or max_steps runs out
+def run_episode(task):
+    set_index, difficulty, seed, max_steps = task
+    from data.game import LineBallSim
+    from data.autoplay import AutoPlacer
+    sim = LineBallSim(seed=seed, difficulty=difficulty)
+    player = AutoPlacer(seed=seed, restart=False)
+    steps = 0
+    while steps < max_steps and not sim.end_game:
+        sim.step(player.inputs(sim))
+        steps += 1
+    return set_index, int(sim.game_score), steps, sim.end_game
+
+# "gravity=1e-3,laser_odds=200" -> {'gravity': 0.001, 'laser_odds': 200}, ValueError on a bad pair
+def parse_set(text):
+    difficulty = {}
+    for pair in text.split(','):
+        key, sep, value = pair.partition('=')
+        key, value = key.strip(), value.strip()
+        if not sep or not key or not value:
+            raise ValueError('expected KEY=VALUE, got %r' % pair.strip())
+        try:
+            difficulty[key] = int(value)
+        except ValueError:
+            try:
+                difficulty[key] = float(value)
+            except ValueError:
+                raise ValueError('%s needs a number, got %r' % (key, value))
+    return difficulty
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(len(values) * p / 100))]
+
+def run_batch(param_sets, episodes, workers, max_steps, seed=0):
+    tasks = [(i, difficulty, seed + n, max_steps) for i, difficulty in enumerate(param_sets) for n in range(episodes)]
+    results = [[] for i in param_sets]
+    start = time.perf_counter()
+    if workers == 1:
+        init_worker()
+        for task in tasks:
+            result = run_episode(task)
+            results[result[0]].append(result[1:])
+    else:
+        pool = multiprocessing.Pool(workers, initializer=init_worker)
+        for result in pool.imap_unordered(run_episode, tasks, chunksize=max(1, len(tasks) // (workers * 16))):
+            results[result[0]].append(result[1:])
+        # close + join instead of the context manager's terminate(), pygame in the workers doesn't die on SIGTERM
+        pool.close()
+        pool.join()
+    return results, time.perf_counter() - start
+
+def report(param_sets, results, elapsed, workers):
+    total = sum(len(r) for r in results)
+    for difficulty, set_results in zip(param_sets, results):
+        heights = sorted(r[0] for r in set_results)
+        deaths = sum(1 for r in set_results if r[2])
+        steps = sum(r[1] for r in set_results)
+        print('%s' % (', '.join('%s=%s' % kv for kv in sorted(difficulty.items())) or 'default difficulty'))
+        print('  %d episodes, %d died, %.0f steps each | height mean %.0f p10 %d p50 %d p90 %d max %d' % (
+            len(heights), deaths, steps / len(heights), sum(heights) / len(heights),
+            percentile(heights, 10), percentile(heights, 50), percentile(heights, 90), heights[-1]))
+        bucket = max(50, (heights[-1] // 10 // 50 + 1) * 50)
+        counts = {}
+        for h in heights:
+            counts[h // bucket] = counts.get(h // bucket, 0) + 1
+        for b in range(max(counts) + 1):
+            n = counts.get(b, 0)
+            print('  %5d-%-5d %5d %s' % (b * bucket, (b + 1) * bucket - 1, n, '#' * int(50 * n / len(heights))))
+    print('%d episodes in %.1fs on %d worker%s: %.1f episodes/s, %.1f episodes/s per worker' % (
+        total, elapsed, workers, '' if workers == 1 else 's', total / elapsed, total / elapsed / workers))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--episodes', type=int, default=1000, help='episodes per difficulty setting')
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--max-steps', type=int, default=36000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE,...', help='a difficulty setting to try, see DEFAULT_DIFFICULTY in data/game.py')
+    parser.add_argument('--scaling', action='store_true')
+    args = parser.parse_args()
+
+    try:
+        param_sets = [parse_set(s) for s in args.set] or [{}]
+    except ValueError as exc:
+        parser.error('--set: %s' % exc)
+
+    if args.scaling:
+        workers = 1
+        while workers <= args.workers:
+            results, elapsed = run_batch(param_sets[:1], args.episodes, workers, args.max_steps, args.seed)
+            print('%2d workers | %6.1f episodes/s | %5.1f episodes/s per worker' % (
+                workers, args.episodes / elapsed, args.episodes / elapsed / workers))
+            workers *= 2
+        return
+
+    results, elapsed = run_batch(param_sets, args.episodes, args.workers, args.max_steps, args.seed)
+    report(param_sets, results, elapsed, args.workers)
+
+if __name__ == '__main__':
+    main()
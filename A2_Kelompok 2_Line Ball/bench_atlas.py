@@ -0,0 +1,111 @@
+import os, time, shutil, tempfile, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+pygame.display.set_mode((275, 400))
+import data.entities as e
+import data.atlas as atlas
+
+# startup cost of loading every frame with the directory scan vs the packed atlas,
+# on the game's own particles and on a made up set of 40 animations x 8 frames + 20 particle types.
+# also the cold start after a checkout, when every source has a new mtime: the first load reads the
+# sources once and stores the new mtimes, the one after it is back to the plain atlas load
+
+RUNS = 20
+
+def reset():
+    e.animation_database.clear()
+    e.animation_higher_database.clear()
+    e.particle_images.clear()
+
+def scan_load(root):
+    if os.path.isdir(root + '/animations'):
+        e.load_animations2(root + '/animations')
+    e.load_particle_images(root + '/particles')
+
+def atlas_load(root):
+    assert atlas.load_atlas(root + '/atlas.json', root + '/animations', root + '/particles')
+
+def timed(func, root):
+    best = None
+    for i in range(RUNS):
+        reset()
+        start = time.perf_counter()
+        func(root)
+        t = time.perf_counter() - start
+        best = t if best is None else min(best, t)
+    return best * 1000
+
+def touch(root):
+    now = time.time_ns()
+    for key, path in atlas.scan_sources(root + '/animations', root + '/particles'):
+        os.utime(path, ns=(now, now))
+
+def touched_load(root):
+    total = 0
+    for i in range(RUNS):
+        touch(root)
+        reset()
+        start = time.perf_counter()
+        atlas_load(root)
+        total += time.perf_counter() - start
+    reset()
+    start = time.perf_counter()
+    atlas_load(root)
+    return total / RUNS * 1000, (time.perf_counter() - start) * 1000
+
+def snapshot():
+    frames = {}
+    for name, images in e.particle_images.items():
+        for i, img in enumerate(images):
+            frames['particle/%s/%d' % (name, i)] = (pygame.image.tostring(img, 'RGB'), img.get_colorkey())
+    for image_id, img in e.animation_database.items():
+        frames[image_id] = (pygame.image.tostring(img, 'RGB'), img.get_colorkey())
+    # listdir order isn't fixed, so compare the animations sorted
+    animations = sorted((s, a, repr(v)) for s in e.animation_higher_database for a, v in e.animation_higher_database[s].items())
+    return frames, animations
+
+def make_synthetic(root):
+    rng = random.Random(0)
+    for s in range(4):
+        for a in range(10):
+            folder = '%s/animations/set%d/anim%d' % (root, s, a)
+            os.makedirs(folder)
+            for f in range(8):
+                img = pygame.Surface((32, 32))
+                img.fill((rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)))
+                pygame.draw.circle(img, (255, 255, 255), (16, 16), rng.randint(4, 15))
+                pygame.image.save(img, '%s/anim%d_%d.png' % (folder, a, f))
+    for p in range(20):
+        folder = '%s/particles/p%d' % (root, p)
+        os.makedirs(folder)
+        for f in range(6):
+            img = pygame.Surface((8, 8))
+            img.fill((rng.randint(0, 255), 0, 0))
+            pygame.image.save(img, '%s/%d.png' % (folder, f))
+
+def compare(name, root):
+    atlas.build_atlas(root + '/atlas.json', root + '/animations', root + '/particles')
+    reset()
+    scan_load(root)
+    expected = snapshot()
+    reset()
+    atlas_load(root)
+    assert snapshot() == expected
+    frames = len(expected[0])
+    scan_time = timed(scan_load, root)
+    atlas_time = timed(atlas_load, root)
+    touched_time, next_time = touched_load(root)
+    print('%-10s %4d frames | directory scan %7.2f ms | atlas %7.2f ms | %5.1fx | frames match' % (
+        name, frames, scan_time, atlas_time, scan_time / atlas_time))
+    print('%-10s after touching every source: first atlas load %7.2f ms, next one %7.2f ms' % (
+        '', touched_time, next_time))
+
+temp = tempfile.mkdtemp()
+try:
+    shutil.copytree('data/images/particles', temp + '/game/particles')
+    compare('game', temp + '/game')
+    make_synthetic(temp + '/synthetic')
+    compare('synthetic', temp + '/synthetic')
+finally:
+    shutil.rmtree(temp)
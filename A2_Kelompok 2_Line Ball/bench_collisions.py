@@ -0,0 +1,78 @@
+import random, time
+from data.collisions import find_crossings, SegmentBatch, PlatformCollider
+from data.platforms import PlatformStore
+
+# times one player move against n platforms with the pure python path and the numpy batch,
+# and checks that both report the same crossings
+
+MOVES = 200
+
+def random_line():
+    x = random.randint(0, 275)
+    y = random.randint(-2000, 400)
+    return sorted([[x, y], [x + random.randint(-100, 100), y + random.randint(-50, 50)]])
+
+def random_move():
+    start = [random.randint(0, 275) + random.random(), random.randint(-2000, 400) + random.random()]
+    end = [start[0] + random.uniform(-6, 6), start[1] + random.uniform(-6, 6)]
+    return start, end
+
+random.seed(0)
+for count in [100, 1000, 10000]:
+    lines = [random_line() for i in range(count)]
+    moves = [random_move() for i in range(MOVES)]
+    # make sure some moves actually cross something
+    for line in lines[:MOVES // 2]:
+        mid = [(line[0][0] + line[1][0]) / 2, (line[0][1] + line[1][1]) / 2]
+        moves.append(([mid[0] - 2.5, mid[1] - 3.5], [mid[0] + 2.5, mid[1] + 3.5]))
+
+    start_time = time.perf_counter()
+    expected = [find_crossings(lines, start, end) for start, end in moves]
+    python_time = (time.perf_counter() - start_time) / len(moves)
+
+    batch = SegmentBatch(lines)
+    start_time = time.perf_counter()
+    found = [batch.crossings(start, end) for start, end in moves]
+    numpy_time = (time.perf_counter() - start_time) / len(moves)
+
+    assert found == expected
+    hits = sum(len(f) for f in found)
+    print('%5d segments | python %9.1f us | numpy %7.1f us | %5.1fx | %d crossings match' % (
+        count, python_time * 1000000, numpy_time * 1000000, python_time / numpy_time, hits))
+
+# the collider builds a batch from the nearby lines on every call, so the break-even point counts the
+# build too. PlatformCollider's default threshold is the first count where numpy clearly wins here
+break_even = None
+for count in [16, 32, 48, 64, 96, 128, 192, 256]:
+    lines = [random_line() for i in range(count)]
+    moves = [random_move() for i in range(MOVES)]
+    start_time = time.perf_counter()
+    for start, end in moves:
+        find_crossings(lines, start, end)
+    python_time = (time.perf_counter() - start_time) / len(moves)
+    start_time = time.perf_counter()
+    for start, end in moves:
+        SegmentBatch(lines).crossings(start, end)
+    numpy_time = (time.perf_counter() - start_time) / len(moves)
+    if break_even is None and numpy_time < python_time:
+        break_even = count
+    print('%5d near a move | python %7.1f us | build + numpy %7.1f us' % (count, python_time * 1000000, numpy_time * 1000000))
+print('numpy batch pays for itself from %s lines' % break_even)
+
+# what the game calls: the lines near the move, in python below the threshold and numpy above it.
+# a few lines like a real game, then a pile of them stacked inside one band
+collider = PlatformCollider()
+for count, height in [(7, 400), (400, 40)]:
+    store = PlatformStore()
+    for i in range(count):
+        line = random_line()
+        store.add([[line[0][0], line[0][1] % height], [line[1][0], line[1][1] % height]])
+    moves = [([random.randint(0, 275) + random.random(), random.randint(0, height) + random.random()], None) for i in range(MOVES)]
+    moves = [(start, [start[0] + random.uniform(-6, 6), start[1] + random.uniform(-6, 6)]) for start, end in moves]
+    start_time = time.perf_counter()
+    found = [collider.crossings(store, start, end) for start, end in moves]
+    collider_time = (time.perf_counter() - start_time) / len(moves)
+    assert found == [find_crossings(store.near(start, end), start, end) for start, end in moves]
+    near = sum(len(store.near(start, end)) for start, end in moves) / len(moves)
+    print('%5d stored, %5.1f near a move | %s | collider %7.1f us | same crossings' % (
+        count, near, 'numpy' if near >= collider.threshold else 'python', collider_time * 1000000))
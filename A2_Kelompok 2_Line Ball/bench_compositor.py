@@ -0,0 +1,89 @@
+import os, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+BORDER_WIDTH = 70
+screen = pygame.display.set_mode((550 + 2 * BORDER_WIDTH, 800))
+from data.compositor import Compositor
+
+# runs the final draw stage for a few hundred frames with the old per-frame surfaces and with
+# the compositor, counting Surface allocations along the way
+
+FRAMES = 600
+background_color = (13, 20, 33)
+allocations = 0
+
+real_surface = pygame.Surface
+real_scale = pygame.transform.scale
+
+class CountingSurface(real_surface):
+    def __init__(self, *args, **kwargs):
+        global allocations
+        allocations += 1
+        super().__init__(*args, **kwargs)
+
+def counting_scale(surf, size, dest=None):
+    global allocations
+    if dest is None:
+        allocations += 1
+        return real_scale(surf, size)
+    return real_scale(surf, size, dest)
+
+def counting_copy(surf):
+    global allocations
+    allocations += 1
+    return surf.copy()
+
+display = pygame.Surface((275, 400))
+gui_display = pygame.Surface((275, 400))
+gui_display.set_colorkey((0, 0, 0))
+
+def draw_scene(frame):
+    display.fill(background_color)
+    gui_display.fill((0, 0, 0))
+    for i in range(20):
+        pygame.draw.circle(display, (255, 255, 255), ((frame * 3 + i * 37) % 275, (i * 53) % 400), 6, 2)
+    pygame.draw.rect(gui_display, (255, 255, 255), (6, 4, 60, 8))
+
+def old_compose(transition):
+    display_background = counting_copy(display)
+    display_background.set_alpha(25)
+    black_surf = pygame.Surface(screen.get_size())
+    black_surf.fill(background_color)
+    black_surf.set_alpha(85)
+    display.set_colorkey(background_color)
+    screen.blit(pygame.transform.scale(display_background, (590, 840)), (-20 + BORDER_WIDTH, 0))
+    screen.blit(black_surf, (0, 0))
+    screen.blit(pygame.transform.scale(display, (550, 800)), (BORDER_WIDTH, 0))
+    screen.blit(pygame.transform.scale(gui_display, (550, 800)), (BORDER_WIDTH, 0))
+    pygame.draw.rect(screen, (0, 0, 0), (0, 0, BORDER_WIDTH, 800))
+    pygame.draw.rect(screen, (0, 0, 0), (screen.get_width() - BORDER_WIDTH, 0, BORDER_WIDTH, 800))
+    if transition:
+        fade = pygame.Surface(screen.get_size())
+        fade.set_alpha(int(255 * transition / 30))
+        screen.blit(fade, (0, 0))
+    pygame.display.update()
+
+def run(compose):
+    global allocations
+    display.set_colorkey(background_color)
+    screen.fill((0, 0, 0))
+    allocations = 0
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        draw_scene(frame)
+        compose(max(0, 30 - frame))
+    return (time.perf_counter() - start) / FRAMES * 1000, allocations, pygame.image.tobytes(screen, 'RGB')
+
+pygame.Surface = CountingSurface
+pygame.transform.scale = counting_scale
+
+old_ms, old_allocs, old_pixels = run(old_compose)
+allocations = 0
+compositor = Compositor(screen, display, gui_display, BORDER_WIDTH, background_color)
+setup_allocs = allocations
+new_ms, new_allocs, new_pixels = run(lambda transition: compositor.compose(display, gui_display, (0, 0), int(255 * transition / 30)))
+
+print('old path:   %.3f ms/frame, %d surface allocations (%.1f per frame)' % (old_ms, old_allocs, old_allocs / FRAMES))
+print('compositor: %.3f ms/frame, %d surface allocations after setup (%d at setup)' % (new_ms, new_allocs, setup_allocs))
+print('identical final frame:', old_pixels == new_pixels)
@@ -0,0 +1,78 @@
+import os, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+pygame.display.set_mode((275, 400))
+import data.text as text
+from data.core_funcs import swap_color
+
+# loads both font sheets with the old clip (a full sheet copy per glyph, then a glyph copy)
+# and with the clip_view letters, checks the rendered text is the same, then compares glyph blit cost
+
+RUNS = 50
+FONTS = ['data/fonts/large_font.png', 'data/fonts/small_font.png']
+LINE = 'score: 12345 high: 9 BEST press R'
+
+def old_clip(surf, x, y, x_size, y_size):
+    handle_surf = surf.copy()
+    clipR = pygame.Rect(x, y, x_size, y_size)
+    handle_surf.set_clip(clipR)
+    image = surf.subsurface(handle_surf.get_clip())
+    return image.copy()
+
+copied = [0]
+
+def old_load_font_img(path, font_color):
+    fg_color = (255, 0, 0)
+    bg_color = (0, 0, 0)
+    font_img = pygame.image.load(path).convert()
+    font_img = swap_color(font_img, fg_color, font_color)
+    last_x = 0
+    letters = []
+    letter_spacing = []
+    for x in range(font_img.get_width()):
+        if font_img.get_at((x, 0))[0] == 127:
+            letter = old_clip(font_img, last_x, 0, x - last_x, font_img.get_height())
+            copied[0] += font_img.get_width() * font_img.get_height() * font_img.get_bytesize()
+            copied[0] += letter.get_width() * letter.get_height() * letter.get_bytesize()
+            letters.append(letter)
+            letter_spacing.append(x - last_x)
+            last_x = x + 1
+    for letter in letters:
+        letter.set_colorkey(bg_color)
+    return letters, letter_spacing, font_img.get_height()
+
+def timed(loader, path):
+    start = time.perf_counter()
+    for i in range(RUNS):
+        result = loader(path, (255, 255, 255))
+    return (time.perf_counter() - start) / RUNS * 1000, result
+
+def draw(letters, spacing, height):
+    font = text.Font.__new__(text.Font)
+    text.Font.__init__(font, FONTS[0], (255, 255, 255))
+    font.letters, font.letter_spacing, font.line_height = letters, spacing, height
+    font.space_width = spacing[0]
+    surf = pygame.Surface((275, 40))
+    font.draw_text(LINE, surf, (0, 0))
+    return pygame.image.tostring(surf, 'RGB')
+
+for path in FONTS:
+    copied[0] = 0
+    old_time, old = timed(old_load_font_img, path)
+    old_bytes = copied[0] // RUNS
+    new_time, new = timed(text.load_font_img, path)
+    assert draw(*old) == draw(*new)
+    letter_bytes = sum(l.get_width() * l.get_height() * l.get_bytesize() for l in old[0])
+    print('%-26s %2d glyphs | old %6.2f ms, %7.1f KB copied, %5.1f KB kept | views %6.2f ms, 0 KB copied | %4.1fx | same text' % (
+        path, len(old[0]), old_time, old_bytes / 1024, letter_bytes / 1024, new_time, old_time / new_time))
+
+# blitting from a view goes through the parent sheet, which costs a bit per glyph
+surf = pygame.Surface((275, 40))
+for name, loader in [('copied glyphs', old_load_font_img), ('view glyphs', text.load_font_img)]:
+    letters = loader(FONTS[0], (255, 255, 255))[0]
+    start = time.perf_counter()
+    for i in range(1000):
+        for letter in letters:
+            surf.blit(letter, (0, 0))
+    print('%-14s %5.0f ns per glyph blit' % (name, (time.perf_counter() - start) / 1000 / len(letters) * 1000000000))
@@ -0,0 +1,60 @@
+import time, random, copy
+import pygame
+import data.entities as e
+
+# random tile maps with solid tiles, ramps and thin platforms. every mover gets moved twice,
+# once with the plain lists and once with the CollisionGrid, and both have to end up in the same
+# place with the same collision data. then both are timed on the biggest map
+
+TILE = 16
+MOVES = 3000
+
+def random_map(rng, width, height, density):
+    platforms = []
+    ramps = []
+    thin_platforms = []
+    for x in range(width):
+        for y in range(height):
+            roll = rng.random()
+            rect = pygame.Rect(x * TILE, y * TILE, TILE, TILE)
+            if roll < density:
+                platforms.append(rect)
+            elif roll < density * 1.15:
+                ramps.append([rng.choice([1, 2]), rect])
+            elif roll < density * 1.3:
+                thin_platforms.append(pygame.Rect(x * TILE, y * TILE, TILE, 4))
+    # some odd sized and overlapping rects too
+    for i in range(len(platforms) // 20):
+        platforms.append(pygame.Rect(rng.randint(0, width * TILE), rng.randint(0, height * TILE), rng.randint(1, 90), rng.randint(1, 90)))
+    rng.shuffle(platforms)
+    return platforms, ramps, thin_platforms
+
+def random_moves(rng, width, height):
+    moves = []
+    for i in range(MOVES):
+        obj = e.physics_obj(rng.randint(-20, width * TILE), rng.randint(-20, height * TILE), rng.randint(4, 40), rng.randint(4, 40))
+        moves.append((obj, [rng.uniform(-12, 12), rng.uniform(-12, 12)]))
+    return moves
+
+def run(moves, level, grid=None):
+    results = []
+    start = time.perf_counter()
+    for obj, movement in moves:
+        collisions = obj.move(movement, level[0], level[1], level[2], grid)
+        results.append((collisions, tuple(obj.rect), obj.x, obj.y))
+    return (time.perf_counter() - start) / len(moves), results
+
+rng = random.Random(0)
+for width, height, density in [(20, 20, 0.1), (60, 60, 0.3), (150, 150, 0.35)]:
+    level = random_map(rng, width, height, density)
+    moves = random_moves(rng, width, height)
+    grid = e.CollisionGrid(64, *level)
+
+    list_time, expected = run(copy.deepcopy(moves), level)
+    grid_time, found = run(copy.deepcopy(moves), level, grid)
+
+    assert found == expected
+    hits = sum(1 for r in expected if r[0]['data'] or r[0]['bottom'])
+    print('%6d rects | list %8.1f us/move | grid %6.1f us/move | %6.1fx | %d of %d moves collided, all match' % (
+        len(level[0]) + len(level[1]) + len(level[2]), list_time * 1000000, grid_time * 1000000,
+        list_time / grid_time, hits, len(moves)))
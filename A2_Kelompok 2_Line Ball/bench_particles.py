@@ -0,0 +1,51 @@
+import os, random, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+pygame.display.set_mode((275, 400))
+import data.entities as e
+from data.particles import ParticlePool
+
+# update + draw cost per frame for n live particles, old object list vs ParticlePool
+
+FRAMES = 120
+COLORS = [(90, 210, 255), (170, 170, 170), (160, 40, 80)]
+
+e.load_particle_images('data/images/particles')
+e.set_global_colorkey((0, 0, 0))
+display = pygame.Surface((275, 400))
+
+def spawn_args():
+    return ([random.randint(0, 275), random.randint(0, 400)], 'p',
+            [random.randint(-10, 10) / 10, random.randint(-10, 10) / 10],
+            0.05, random.randint(0, 20) / 10, random.choice(COLORS))
+
+def run_list(count):
+    particles = []
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        while len(particles) < count:
+            particles.append(e.particle(*spawn_args()))
+        for i, particle in sorted(enumerate(particles), reverse=True):
+            if not particle.update(1):
+                particles.pop(i)
+            else:
+                particle.draw(display, [0, 0])
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def run_pool(count):
+    particles = ParticlePool()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        while len(particles) < count:
+            particles.spawn(*spawn_args())
+        particles.update(1)
+        particles.draw(display, [0, 0])
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+for count in [2000, 10000, 20000]:
+    random.seed(0)
+    list_ms = run_list(count)
+    random.seed(0)
+    pool_ms = run_pool(count)
+    print('%6d particles | list %7.2f ms/frame | pool %6.2f ms/frame' % (count, list_ms, pool_ms))
@@ -0,0 +1,77 @@
+import random, time
+from data.platforms import PlatformStore
+
+# compares the per-frame platform work (culling + both side checks) at the start of a run
+# and at score 50k, once with the old ever-growing list and once with the banded store
+
+WIDTH = 275
+HEIGHT = 400
+FRAMES = 2000
+
+def check_line_sides(lines, point):
+    return [(line[1][0] - line[0][0]) * (point[1] - line[0][1]) - (line[1][1] - line[0][1]) * (point[0] - line[0][0]) for line in lines]
+
+def build(score, store):
+    random.seed(1)
+    lines = [[[0, HEIGHT - 1], [WIDTH, HEIGHT - 1]]]
+    store.add(lines[0], permanent=True)
+    scroll = 0
+    while -scroll < score:
+        scroll -= 50
+        if random.randint(1, 3) <= 2:
+            base_x = random.randint(0, WIDTH)
+            line = sorted([[base_x, scroll - 80], [base_x + random.randint(0, 200) - 100, scroll - 80 + random.randint(0, 100) - 50]])
+            lines.append(line)
+            store.add(line)
+        store.retire(scroll, HEIGHT)
+    return lines, scroll
+
+def frame_list(lines, scroll, player):
+    visible = [l for l in lines if min(l[0][1], l[1][1]) < scroll + HEIGHT + 20 and max(l[0][1], l[1][1]) > scroll - 20]
+    check_line_sides(lines, player)
+    check_line_sides(lines, [player[0], player[1] + 1])
+    return visible
+
+def frame_store(store, scroll, player):
+    visible = store.visible(scroll, HEIGHT)
+    end = [player[0], player[1] + 1]
+    nearby = store.near(player, end)
+    check_line_sides(nearby, player)
+    check_line_sides(nearby, end)
+    store.retire(scroll, HEIGHT)
+    return visible
+
+def run(func, target, scroll):
+    player = [WIDTH / 2, scroll + 200]
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        func(target, scroll, player)
+    return (time.perf_counter() - start) / FRAMES * 1000000
+
+for score in [0, 50000]:
+    store = PlatformStore()
+    lines, scroll = build(score, store)
+    print('score %6d | list: %5d lines %8.1f us/frame | store: %4d lines %6.1f us/frame' % (
+        score, len(lines), run(frame_list, lines, scroll), len(store), run(frame_store, store, scroll)))
+
+# the store has to stay the same size however high the run goes, retired lines included
+store = PlatformStore()
+sizes = []
+for score in range(10000, 50001, 10000):
+    build(score, store)
+    sizes.append(len(store) + len(store.retired))
+    store.clear()
+assert max(sizes) <= min(sizes) * 1.5, sizes
+print('stored lines (live + retired) at score 10k..50k: %s' % ' '.join(str(size) for size in sizes))
+
+# the game over pan scrolls back down to the ground, retired lines have to still be drawn for the first
+# pan_distance of it, past that only the floor is left
+store = PlatformStore()
+lines, scroll = build(50000, store)
+kept_limit = scroll + HEIGHT + store.retire_distance + store.pan_distance
+while scroll < 0:
+    expected = [l for l in lines if min(l[0][1], l[1][1]) <= scroll + HEIGHT + 20 and max(l[0][1], l[1][1]) >= scroll - 20
+                and (min(l[0][1], l[1][1]) <= kept_limit or l is lines[0])]
+    assert store.visible(scroll, HEIGHT) == expected, scroll
+    scroll += 97
+print('game over pan: retired lines drawn for the first %dpx (%d live, %d retired)' % (store.pan_distance, len(store), len(store.retired)))
@@ -0,0 +1,38 @@
+import os, time
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+pygame.display.set_mode((275, 400))
+import data.text as text
+
+# renders a 20 character HUD line 10k times: the old per-glyph path with font_order.index,
+# the per-glyph path with the glyph dict, and the cached string surface
+
+RUNS = 10000
+LINE = 'score: 12345 high: 9'
+
+font = text.Font('data/fonts/large_font.png', (255, 255, 255))
+surf = pygame.Surface((275, 400))
+
+def old_render(font, text, surf, loc):
+    x_offset = 0
+    for char in text:
+        if char != ' ':
+            surf.blit(font.letters[font.font_order.index(char)], (loc[0] + x_offset, loc[1]))
+            x_offset += font.letter_spacing[font.font_order.index(char)] + font.base_spacing
+        else:
+            x_offset += font.space_width + font.base_spacing
+
+def timed(func):
+    start = time.perf_counter()
+    for i in range(RUNS):
+        func()
+    return (time.perf_counter() - start) * 1000
+
+results = [
+    ('glyph by glyph (list.index)', timed(lambda: old_render(font, LINE, surf, (6, 4)))),
+    ('glyph by glyph (glyph dict)', timed(lambda: font.draw_text(LINE, surf, (6, 4)))),
+    ('cached string surface', timed(lambda: font.render(LINE, surf, (6, 4)))),
+]
+for name, ms in results:
+    print('%-28s %8.1f ms total, %6.2f us per line' % (name, ms, ms * 1000 / RUNS))
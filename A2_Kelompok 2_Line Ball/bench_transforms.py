@@ -0,0 +1,69 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+pygame.init()
+pygame.display.set_mode((275, 400))
+import data.entities as e
+
+# 500 animated entities turning at different speeds, drawn for 300 frames with the old
+# flip/copy/rotate per draw and with the transform cache
+
+ENTITIES = 500
+FRAMES = 300
+
+# a 4 frame 'idle' animation for a made up entity type, since Line Ball has no animations of its own
+for i in range(4):
+    img = pygame.Surface((16, 16))
+    img.fill((255, 255, 255))
+    pygame.draw.rect(img, (40 * i, 120, 200), (2, 2, 12, 12))
+    img.set_colorkey((255, 255, 255))
+    e.animation_database['bench_' + str(i)] = img
+e.animation_higher_database['bench'] = {'idle': [['bench_' + str(i // 5) for i in range(20)], ['loop']]}
+
+def old_display(self, surface, scroll):
+    image_to_render = None
+    if self.animation == None:
+        if self.image != None:
+            image_to_render = e.flip(self.image,self.flip).copy()
+    else:
+        image_to_render = e.flip(e.animation_database[self.animation[self.animation_frame]],self.flip).copy()
+    if image_to_render != None:
+        center_x = image_to_render.get_width()/2
+        center_y = image_to_render.get_height()/2
+        image_to_render = pygame.transform.rotate(image_to_render,self.rotation)
+        if self.alpha != None:
+            image_to_render.set_alpha(self.alpha)
+        e.blit_center(surface,image_to_render,(int(self.x)-scroll[0]+self.offset[0]+center_x,int(self.y)-scroll[1]+self.offset[1]+center_y))
+
+def make_entities():
+    rng = random.Random(0)
+    entities = []
+    for i in range(ENTITIES):
+        entity = e.entity(rng.randint(0, 260), rng.randint(0, 380), 16, 16, 'bench')
+        entity.set_flip(rng.randint(0, 1) == 1)
+        entity.set_frame(rng.randint(0, 19))
+        entity.spin = rng.choice([-3, -2, -1, 1, 2, 3])
+        entities.append(entity)
+    return entities
+
+def run(draw):
+    surf = pygame.Surface((275, 400))
+    entities = make_entities()
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        surf.fill((0, 0, 0))
+        for entity in entities:
+            entity.handle()
+            entity.rotation += entity.spin
+            draw(entity, surf, [0, 0])
+    return (time.perf_counter() - start) / FRAMES * 1000, surf
+
+old_time, old_surf = run(old_display)
+for quantum in [1, 5]:
+    e.transform_cache = e.TransformCache(quantum=quantum)
+    new_time, new_surf = run(e.entity.display)
+    cache = e.transform_cache
+    same = pygame.image.tostring(old_surf, 'RGB') == pygame.image.tostring(new_surf, 'RGB')
+    print('quantum %d | old %6.2f ms/frame | cached %6.2f ms/frame | %4.1fx | hit rate %5.1f%% | %d entries | %s' % (
+        quantum, old_time, new_time, old_time / new_time, 100 * cache.hits / (cache.hits + cache.misses),
+        len(cache.surfaces), 'same pixels' if same else 'pixels differ'))
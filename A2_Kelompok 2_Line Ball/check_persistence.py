@@ -0,0 +1,92 @@
+import os, time, builtins, threading, tempfile
+from data.persistence import HighScoreStore
+
+# checks what HighScoreStore promises:
+#   - a frame loop calling submit() every frame (and flush() on deaths) never opens, syncs or renames
+#     a file on the main thread
+#   - if the game dies at any moment, the file holds at least the score submitted one interval ago
+#   - flush() gets the score on disk well before the interval is up, close() writes it before returning
+
+FRAMES = 3000
+
+def read_score(path):
+    with open(path) as f:
+        return int(f.read())
+
+def check_no_main_thread_io(path):
+    main_thread_io = []
+    background_io = []
+    originals = (builtins.open, os.replace, os.fsync)
+
+    def watched(name, func):
+        def call(*args, **kwargs):
+            (main_thread_io if threading.current_thread() is threading.main_thread() else background_io).append(name)
+            return func(*args, **kwargs)
+        return call
+
+    store = HighScoreStore(path, interval=0.02)
+    builtins.open, os.replace, os.fsync = watched('open', originals[0]), watched('os.replace', originals[1]), watched('os.fsync', originals[2])
+    try:
+        for frame in range(FRAMES):
+            store.submit(frame)
+            if frame % 500 == 499:
+                store.flush()
+            time.sleep(0.0005)
+        time.sleep(0.1)
+    finally:
+        builtins.open, os.replace, os.fsync = originals
+    store.close()
+    assert not main_thread_io, main_thread_io
+    assert background_io and store.writes > 0
+    assert read_score(path) == FRAMES - 1
+    print('%d submit() calls: no file I/O on the main thread, %d writes from the background thread' % (FRAMES, store.writes))
+
+def check_crash_window(path, interval=0.1, seconds=3):
+    # slack for the thread waking up late and the write itself
+    slack = 0.05
+    store = HighScoreStore(path, interval=interval)
+    history = []
+    checks = 0
+    worst = 0
+    start = time.perf_counter()
+    score = 0
+    while time.perf_counter() - start < seconds:
+        score += 1
+        store.submit(score)
+        now = time.perf_counter()
+        history.append((now, score))
+        if score % 50 == 0 and os.path.exists(path):
+            # what a crash right now would leave behind
+            on_disk = read_score(path)
+            owed = [s for t, s in history if t <= now - interval - slack]
+            if owed:
+                assert on_disk >= owed[-1], (on_disk, owed[-1])
+            lost = [t for t, s in history if s > on_disk]
+            if lost:
+                worst = max(worst, now - lost[0])
+            checks += 1
+        time.sleep(0.001)
+    # crash: no close(), the daemon thread just goes away with the process
+    print('%d simulated crashes over %.0fs: never more than %.0f ms of scores lost (interval %.0f ms)' % (
+        checks, seconds, worst * 1000, interval * 1000))
+
+def check_flush_and_close(path):
+    store = HighScoreStore(path, interval=5)
+    store.submit(store.high_score + 1000)
+    start = time.perf_counter()
+    store.flush()
+    while store.saved != store.high_score:
+        assert time.perf_counter() - start < 1, 'flush() waited for the interval'
+        time.sleep(0.001)
+    flush_time = time.perf_counter() - start
+    assert read_score(path) == store.high_score
+    store.submit(store.high_score + 1)
+    store.close()
+    assert read_score(path) == store.high_score
+    assert not os.path.exists(path + '.tmp')
+    print('flush() on disk after %.1f ms with a 5 s interval, close() wrote the last score' % (flush_time * 1000))
+
+with tempfile.TemporaryDirectory() as directory:
+    check_no_main_thread_io(os.path.join(directory, 'io.txt'))
+    check_crash_window(os.path.join(directory, 'crash.txt'))
+    check_flush_and_close(os.path.join(directory, 'flush.txt'))
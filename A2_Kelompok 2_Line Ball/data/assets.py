@@ -0,0 +1,115 @@
+import pygame, threading, time
+
+# sounds and music get decoded on a worker thread so the first frames don't wait on them
+# sound() hands back a SoundHandle straight away, and playing one that isn't decoded yet does nothing
+
+class SoundHandle(object):
+
+    def __init__(self, path, volume=None):
+        self.path = path
+        self.volume = volume
+        self.sound = None
+
+    @property
+    def ready(self):
+        return self.sound is not None
+
+    def load(self):
+        sound = pygame.mixer.Sound(self.path)
+        if self.volume is not None:
+            sound.set_volume(self.volume)
+        self.sound = sound
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.sound is not None:
+            self.sound.set_volume(volume)
+
+    def play(self):
+        if self.sound is not None:
+            self.sound.play()
+
+# pygame.mixer.music, which starts playing as soon as it's loaded. play() and pause() before that
+# only record what was asked for, and load() picks up the last one so a death during loading stays quiet
+class MusicHandle(object):
+
+    def __init__(self, path, volume=1, loops=-1):
+        self.path = path
+        self.volume = volume
+        self.loops = loops
+        self.ready = False
+        self.playing = True
+        self.lock = threading.Lock()
+
+    def load(self):
+        pygame.mixer.music.load(self.path)
+        pygame.mixer.music.set_volume(self.volume)
+        with self.lock:
+            if self.playing:
+                pygame.mixer.music.play(self.loops)
+            self.ready = True
+
+    def play(self):
+        with self.lock:
+            self.playing = True
+            if self.ready:
+                pygame.mixer.music.play(self.loops)
+
+    def pause(self):
+        with self.lock:
+            self.playing = False
+            if self.ready:
+                pygame.mixer.music.pause()
+
+class AssetLoader(object):
+
+    def __init__(self):
+        self.jobs = []
+        self.thread = None
+        self.start_time = time.perf_counter()
+        self.done_time = None
+        self.errors = []
+
+    def sound(self, path, volume=None):
+        handle = SoundHandle(path, volume)
+        self.jobs.append((handle.path, handle.load))
+        return handle
+
+    def music(self, path, volume=1, loops=-1):
+        handle = MusicHandle(path, volume, loops)
+        self.jobs.append((handle.path, handle.load))
+        return handle
+
+    def start(self):
+        self.start_time = time.perf_counter()
+        self.thread = threading.Thread(target=self.run, name='assets', daemon=True)
+        self.thread.start()
+
+    # decodes everything on the calling thread before returning, timed from this call
+    def run_sync(self):
+        self.start_time = time.perf_counter()
+        self.run()
+
+    def run(self):
+        for path, load in self.jobs:
+            try:
+                load()
+            except Exception as exc:
+                self.errors.append((path, exc))
+                print('Failed to load %s:' % path, exc)
+        self.done_time = time.perf_counter()
+
+    @property
+    def done(self):
+        return self.done_time is not None
+
+    def wait(self, timeout=None):
+        if self.thread is not None:
+            self.thread.join(timeout)
+        return self.done
+
+    # seconds from start() until everything was decoded
+    def load_time(self):
+        if self.done_time is None:
+            return None
+        return self.done_time - self.start_time
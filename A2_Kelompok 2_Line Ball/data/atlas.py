@@ -0,0 +1,183 @@
+import pygame, os, json, zlib
+import data.entities as e
+
+# every animation and particle frame packed into one image, plus a json index of where each frame sits
+# build it with `python -m data.atlas` from the game folder, load_atlas() then needs a single image load
+# and hands out subsurfaces. if any source frame changed since the build it returns False and the caller
+# goes back to the directory scan
+
+ATLAS_VERSION = 1
+ATLAS_WIDTH = 512
+PADDING = 1
+
+DEFAULT_INDEX = 'data/images/atlas.json'
+DEFAULT_ANIMATIONS = 'data/images/animations'
+DEFAULT_PARTICLES = 'data/images/particles'
+
+# (key, file) for every frame the directory loaders would pick up
+def scan_sources(anim_path=None, particle_path=None):
+    sources = []
+    if anim_path and os.path.isdir(anim_path):
+        for animation_set in sorted(os.listdir(anim_path)):
+            if len(animation_set.split('.')) == 1:
+                for animation in sorted(os.listdir(anim_path + '/' + animation_set)):
+                    folder = anim_path + '/' + animation_set + '/' + animation
+                    for img in sorted(os.listdir(folder)):
+                        sources.append(('anim/' + animation_set + '/' + animation + '/' + img, folder + '/' + img))
+        if os.path.exists(anim_path + '/anim_conf.json'):
+            sources.append(('conf/anim_conf.json', anim_path + '/anim_conf.json'))
+    if particle_path and os.path.isdir(particle_path):
+        for folder in sorted(os.listdir(particle_path)):
+            if os.path.isdir(particle_path + '/' + folder):
+                try:
+                    img_list = e.particle_file_sort(os.listdir(particle_path + '/' + folder))
+                except ValueError:
+                    continue
+                for img in img_list:
+                    sources.append(('particle/' + folder + '/' + img, particle_path + '/' + folder + '/' + img))
+    return sources
+
+def file_crc(path):
+    with open(path, 'rb') as f:
+        return zlib.crc32(f.read())
+
+def source_stamp(path):
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size, file_crc(path)]
+
+# simple shelf packing, tallest frames first
+def pack(sizes, width=ATLAS_WIDTH):
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0]))
+    positions = [None] * len(sizes)
+    x = y = shelf = 0
+    for i in order:
+        w, h = sizes[i]
+        if x + w > width:
+            x = 0
+            y += shelf + PADDING
+            shelf = 0
+        positions[i] = (x, y)
+        x += w + PADDING
+        shelf = max(shelf, h)
+    return positions, y + shelf
+
+def build_atlas(index_path=DEFAULT_INDEX, anim_path=DEFAULT_ANIMATIONS, particle_path=DEFAULT_PARTICLES):
+    # fills in anim_conf.json first so the loader never has to write it and make the atlas stale
+    if anim_path and os.path.isdir(anim_path):
+        e.load_animations2(anim_path)
+    sources = scan_sources(anim_path, particle_path)
+    frames = [(key, path) for key, path in sources if not key.startswith('conf/')]
+    # convert() drops the alpha channel the same way the directory loaders do
+    images = [pygame.image.load(path).convert() for key, path in frames]
+    positions, height = pack([img.get_size() for img in images])
+
+    atlas = pygame.Surface((ATLAS_WIDTH, max(1, height)))
+    # bmp since it loads several times faster than png and the frames have no alpha anyway
+    index = {'version': ATLAS_VERSION, 'image': os.path.basename(index_path)[:-5] + '.bmp', 'frames': {}, 'sources': {}}
+    for (key, path), img, pos in zip(frames, images, positions):
+        atlas.blit(img, pos)
+        index['frames'][key] = [pos[0], pos[1], img.get_width(), img.get_height()]
+    for key, path in sources:
+        index['sources'][key] = source_stamp(path)
+
+    pygame.image.save(atlas, os.path.join(os.path.dirname(index_path), index['image']))
+    with open(index_path, 'w') as f:
+        json.dump(index, f)
+    return index
+
+# keys of the sources whose mtime moved but whose contents didn't, or None if any source changed
+def touched_sources(index, sources):
+    if {key for key, path in sources} != set(index['sources']):
+        return None
+    touched = []
+    for key, path in sources:
+        mtime, size, crc = index['sources'][key]
+        stat = os.stat(path)
+        if stat.st_size != size:
+            return None
+        # only re-read files whose mtime moved
+        if stat.st_mtime_ns != mtime:
+            if file_crc(path) != crc:
+                return None
+            index['sources'][key][0] = stat.st_mtime_ns
+            touched.append(key)
+    return touched
+
+def load_atlas(index_path=DEFAULT_INDEX, anim_path=DEFAULT_ANIMATIONS, particle_path=DEFAULT_PARTICLES):
+    try:
+        with open(index_path, 'r') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if index.get('version') != ATLAS_VERSION:
+        return False
+    touched = touched_sources(index, scan_sources(anim_path, particle_path))
+    if touched is None:
+        return False
+    if touched:
+        # a checkout or copy gives every file a new mtime. store the new ones so only the first
+        # start after that reads the sources, a read only install just keeps checking them
+        try:
+            with open(index_path, 'w') as f:
+                json.dump(index, f)
+        except OSError:
+            pass
+
+    atlas = pygame.image.load(os.path.join(os.path.dirname(index_path), index['image'])).convert()
+    frames = {key: atlas.subsurface(rect) for key, rect in index['frames'].items()}
+
+    if anim_path and os.path.isdir(anim_path):
+        load_animation_frames(anim_path, frames)
+    if particle_path:
+        load_particle_frames(frames)
+    return True
+
+# same results as entities.load_animations2, with the frames coming out of the atlas
+def load_animation_frames(anim_path, frames):
+    anim_config = e.read_anim_config(anim_path)
+    frame_counts = {}
+    for key in frames:
+        if key.startswith('anim/'):
+            path_2 = key[5:key.rfind('/')]
+            frame_counts[path_2] = frame_counts.get(path_2, 0) + 1
+    for path_2 in sorted(frame_counts):
+        animation_set, animation = path_2.split('/')
+        frame_count = frame_counts[path_2]
+        if path_2 not in anim_config:
+            anim_config[path_2] = {'frames': [[v, 5] for v in range(frame_count)], 'tags': ['loop']}
+        base_path = anim_path + '/' + path_2 + '/'
+        anim = []
+        for frame in anim_config[path_2]['frames']:
+            image_id = base_path + animation + '_' + str(frame[0])
+            image = frames['anim/' + path_2 + '/' + animation + '_' + str(frame[0]) + '.png']
+            image.set_colorkey(e.e_colorkey)
+            image.set_alpha(255)
+            e.animation_database[image_id] = image
+            for i in range(frame[1]):
+                anim.append(image_id)
+        if animation_set not in e.animation_higher_database:
+            e.animation_higher_database[animation_set] = {}
+        e.animation_higher_database[animation_set][animation] = [anim, anim_config[path_2]['tags']]
+    e.write_anim_config(anim_path, anim_config)
+    e.transform_cache.clear()
+
+def load_particle_frames(frames):
+    folders = {}
+    for key, image in frames.items():
+        if key.startswith('particle/'):
+            folder, img = key.split('/')[1:]
+            folders.setdefault(folder, []).append((int(img[:-4]), image))
+    for folder, images in folders.items():
+        images.sort(key=lambda v: v[0])
+        for i, image in images:
+            image.set_colorkey(e.e_colorkey)
+        e.particle_images[folder] = [image for i, image in images]
+    e.tint_cache.clear()
+
+if __name__ == '__main__':
+    import sys
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    index_path = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_INDEX
+    index = build_atlas(index_path)
+    print('packed %d frames into %s' % (len(index['frames']), index['image']))
@@ -0,0 +1,44 @@
+import random
+from data.game import INPUT_CLICK, INPUT_RESTART
+
+# a scripted player for headless runs: when the ball is falling it draws a short ramp under it,
+# tilted so the bounce pushes the ball back towards the middle
+
+class AutoPlacer(object):
+
+    def __init__(self, seed=None, cooldown=30, drop=25, spread=30, restart=True):
+        self.rng = random.Random(seed)
+        self.cooldown = cooldown
+        self.drop = drop
+        self.spread = spread
+        self.restart = restart
+        self.wait = 0
+        self.pending = []
+
+    def inputs(self, sim):
+        if sim.end_game:
+            self.pending = []
+            if self.restart and sim.transition == 0:
+                return [(INPUT_RESTART, 0, 0)]
+            return []
+
+        # the second click of a ramp goes in on the frame after the first one
+        if self.pending:
+            return [self.pending.pop(0)]
+
+        if self.wait > 0:
+            self.wait -= 1
+            return []
+
+        x = sim.player_pos[0]
+        y = sim.player_pos[1] - sim.scroll
+        if sim.player_velocity[1] > 0.5 and y > sim.height * 0.4:
+            tilt = 8 if x < sim.width / 2 else -8
+            tilt += self.rng.randint(-3, 3)
+            y = int(y + self.drop)
+            left = [int(x - self.spread), y - tilt]
+            right = [int(x + self.spread), y + tilt]
+            self.pending.append((INPUT_CLICK, right[0], right[1]))
+            self.wait = self.cooldown
+            return [(INPUT_CLICK, left[0], left[1])]
+        return []
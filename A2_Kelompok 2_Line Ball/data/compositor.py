@@ -0,0 +1,67 @@
+import pygame
+
+# final draw stage for Line Ball: the glow, dim overlay, playfield, gui and fade all go into
+# render targets made once up front, and only the playfield area of the window gets pushed
+
+class Compositor(object):
+
+    def __init__(self, screen, display, gui_display, border_width, background_color):
+        self.screen = screen
+        self.background_color = background_color
+        self.scale = (display.get_width() * 2, display.get_height() * 2)
+        self.glow_scale = (display.get_width() * 2 + 40, display.get_height() * 2 + 40)
+        self.play_rect = pygame.Rect(border_width, 0, self.scale[0], screen.get_height())
+        self.left_border = pygame.Rect(0, 0, border_width, screen.get_height())
+        self.right_border = pygame.Rect(screen.get_width() - border_width, 0, border_width, screen.get_height())
+        self.allocations = 0
+
+        self.glow = self.new_target(pygame.transform.scale(display, self.glow_scale))
+        # RLE like the surfaces transform.scale used to hand back, so the blend comes out the same
+        self.glow.set_colorkey(background_color, pygame.RLEACCEL)
+        self.glow.set_alpha(25, pygame.RLEACCEL)
+
+        self.playfield = self.new_target(pygame.transform.scale(display, self.scale))
+        self.playfield.set_colorkey(background_color)
+
+        self.gui = self.new_target(pygame.transform.scale(gui_display, self.scale))
+        self.gui.set_colorkey((0, 0, 0))
+
+        self.dim = self.new_target(pygame.Surface(screen.get_size()))
+        self.dim.fill(background_color)
+        self.dim.set_alpha(85)
+
+        self.fade = self.new_target(pygame.Surface(screen.get_size()))
+
+        self.full_update = True
+
+    def new_target(self, surf):
+        self.allocations += 1
+        return surf
+
+    def compose(self, display, gui_display, offset=(0, 0), fade=0):
+        screen = self.screen
+        display.set_colorkey(self.background_color)
+
+        pygame.transform.scale(display, self.glow_scale, self.glow)
+        screen.blit(self.glow, (self.play_rect.x - 20, 0))
+        screen.blit(self.dim, (0, 0))
+
+        pygame.transform.scale(display, self.scale, self.playfield)
+        screen.blit(self.playfield, (self.play_rect.x + offset[0], offset[1]))
+
+        pygame.transform.scale(gui_display, self.scale, self.gui)
+        screen.blit(self.gui, self.play_rect.topleft)
+
+        screen.fill((0, 0, 0), self.left_border)
+        screen.fill((0, 0, 0), self.right_border)
+
+        if fade:
+            self.fade.set_alpha(fade)
+            screen.blit(self.fade, (0, 0))
+
+        # the borders always end up black, so after the first frame only the playfield is pushed
+        if self.full_update:
+            pygame.display.update()
+            self.full_update = False
+        else:
+            pygame.display.update(self.play_rect)
@@ -22,6 +22,7 @@ def load_image_dir(path, colorkey=(0, 0, 0)):
 def warp_surf(surface, mask, loc, shift):
     offset = [mask.get_width() // 2, mask.get_height() // 2]
     loc = [loc[0] - offset[0], loc[1] - offset[1]]
+    # the mask gets drawn onto this one, so it has to be a copy
     subsurf = clip(surface, loc[0], loc[1], mask.get_width(), mask.get_height())
     mask.set_colorkey((255, 255, 255))
     subsurf.blit(mask, (0, 0))
@@ -36,12 +37,17 @@ def swap_color(img,old_c,new_c):
     surf.blit(img,(0,0))
     return surf
 
+# the part of (x, y, x_size, y_size) that's inside surf
+def clip_rect(surf,x,y,x_size,y_size):
+    return pygame.Rect(x,y,x_size,y_size).clip(surf.get_rect())
+
+# zero-copy view into surf. it shares pixels with surf, so only use it where nothing draws on it
+def clip_view(surf,x,y,x_size,y_size):
+    return surf.subsurface(clip_rect(surf,x,y,x_size,y_size))
+
+# standalone copy of the area, safe to draw on
 def clip(surf,x,y,x_size,y_size):
-    handle_surf = surf.copy()
-    clipR = pygame.Rect(x,y,x_size,y_size)
-    handle_surf.set_clip(clipR)
-    image = surf.subsurface(handle_surf.get_clip())
-    return image.copy()
+    return clip_view(surf,x,y,x_size,y_size).copy()
 
 def rect_corners(points):
     point_1 = points[0]
@@ -50,14 +56,44 @@ def rect_corners(points):
     out_2 = [max(point_1[0], point_2[0]), max(point_1[1], point_2[1])]
     return [out_1, out_2]
 
+# translucent lines, circles and polygons are drawn straight into one persistent SRCALPHA surface
+# and blended onto the target in a single blit, only over the area that was drawn on
+class AlphaLayer(object):
+    def __init__(self, size):
+        self.surf = pygame.Surface(size, pygame.SRCALPHA)
+        self.dirty = None
+
+    def mark(self, rect):
+        if self.dirty is None:
+            self.dirty = rect
+        else:
+            self.dirty.union_ip(rect)
+
+    def line(self, color, p1, p2, width=1):
+        self.mark(pygame.draw.line(self.surf, color, p1, p2, width))
+
+    def circle(self, color, center, radius, width=0):
+        self.mark(pygame.draw.circle(self.surf, color, center, radius, width))
+
+    def polygon(self, color, points, width=0):
+        self.mark(pygame.draw.polygon(self.surf, color, points, width))
+
+    def flush(self, surf, offset=(0, 0)):
+        if self.dirty is not None:
+            surf.blit(self.surf, (self.dirty.x + offset[0], self.dirty.y + offset[1]), self.dirty)
+            self.surf.fill((0, 0, 0, 0), self.dirty)
+            self.dirty = None
+
+alpha_layers = {}
+
+# kept for old call sites, draws through a shared layer per target size
 def alpha_line(surf, color, p1, p2, width=1):
-    alpha = color[3]
-    bounding_rect = corner_rect([p1, p2])
-    temp_surf = pygame.Surface((bounding_rect.size[0] + 1, bounding_rect.size[1] + 1))
-    bounding_corners = rect_corners([p1, p2])
-    pygame.draw.line(temp_surf, color, [p1[0] - bounding_corners[0][0], p1[1] - bounding_corners[0][1]], [p2[0] - bounding_corners[0][0], p2[1] - bounding_corners[0][1]], width)
-    temp_surf.set_alpha(alpha)
-    surf.blit(temp_surf, bounding_corners[0])
+    size = surf.get_size()
+    if size not in alpha_layers:
+        alpha_layers[size] = AlphaLayer(size)
+    layer = alpha_layers[size]
+    layer.line(color, p1, p2, width)
+    layer.flush(surf)
 
 def corner_rect(points):
     points = rect_corners(points)
@@ -86,8 +122,8 @@ def horizontal_crop(loc_x, width, img):
         left_sec = img.get_width() - loc_x
         right_sec = width - left_sec
         output_surf = pygame.Surface((width, img.get_height()))
-        output_surf.blit(clip(img, loc_x, 0, left_sec, img.get_height()), (0,0))
-        output_surf.blit(clip(img, 0, 0, right_sec, img.get_height()), (left_sec,0))
+        output_surf.blit(clip_view(img, loc_x, 0, left_sec, img.get_height()), (0,0))
+        output_surf.blit(clip_view(img, 0, 0, right_sec, img.get_height()), (left_sec,0))
         colorkey = img.get_colorkey()
         output_surf.set_colorkey(colorkey)
         return output_surf
@@ -0,0 +1,214 @@
+import pygame, math, time
+
+# background squares, laser charge lines, rings and sparks for Line Ball
+# every effect type lives in its own list of __slots__ records and is swept in place once per frame
+
+ANGLE_STEPS = 3600
+COS_TABLE = [math.cos(math.radians(i * 360 / ANGLE_STEPS)) for i in range(ANGLE_STEPS)]
+SIN_TABLE = [math.sin(math.radians(i * 360 / ANGLE_STEPS)) for i in range(ANGLE_STEPS)]
+
+def angle_lookup(angle):
+    i = int(round(angle * ANGLE_STEPS / 360)) % ANGLE_STEPS
+    return COS_TABLE[i], SIN_TABLE[i]
+
+EFFECT_TYPES = ['squares', 'lines', 'circles', 'sparks']
+DEFAULT_LIMITS = {'squares': 64, 'lines': 64, 'circles': 64, 'sparks': 1024}
+
+class Spark(object):
+    __slots__ = ['x', 'y', 'angle', 'scale', 'speed', 'color']
+
+    def __init__(self, pos, angle, scale, speed, color):
+        self.x = pos[0]
+        self.y = pos[1]
+        self.angle = angle
+        self.scale = scale
+        self.speed = speed
+        self.color = color
+
+class CircleEffect(object):
+    __slots__ = ['x', 'y', 'radius', 'width', 'width_decay', 'speed', 'speed_decay', 'color']
+
+    def __init__(self, pos, radius, width, width_decay, speed, speed_decay, color):
+        self.x = pos[0]
+        self.y = pos[1]
+        self.radius = radius
+        self.width = width
+        self.width_decay = width_decay
+        self.speed = speed
+        self.speed_decay = speed_decay
+        self.color = color
+
+class SquareEffect(object):
+    __slots__ = ['x', 'y', 'angle', 'speed', 'size', 'decay']
+
+    def __init__(self, pos, angle, speed, size, decay):
+        self.x = pos[0]
+        self.y = pos[1]
+        self.angle = angle
+        self.speed = speed
+        self.size = size
+        self.decay = decay
+
+class LineEffect(object):
+    __slots__ = ['start', 'end', 'target_start', 'target_end', 'color', 'speed', 'life', 'duration']
+
+    def __init__(self, line, target, color, speed, duration):
+        self.start = [line[0][0], line[0][1]]
+        self.end = [line[1][0], line[1][1]]
+        self.target_start = target[0]
+        self.target_end = target[1]
+        self.color = color
+        self.speed = speed
+        self.life = duration
+        self.duration = duration
+
+class Effects(object):
+
+    def __init__(self, limits=None):
+        self.limits = dict(DEFAULT_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.squares = []
+        self.lines = []
+        self.circles = []
+        self.sparks = []
+        self.timings = {}
+        self.reset_timings()
+
+    def __len__(self):
+        return len(self.squares) + len(self.lines) + len(self.circles) + len(self.sparks)
+
+    def clear(self):
+        self.squares = []
+        self.lines = []
+        self.circles = []
+        self.sparks = []
+
+    def reset_timings(self):
+        for effect_type in EFFECT_TYPES:
+            self.timings[effect_type] = 0
+
+    def timing_report(self):
+        total = sum(self.timings.values()) or 1
+        return ', '.join('%s %.2fms (%d%%)' % (t, self.timings[t] / 1000000, 100 * self.timings[t] / total) for t in EFFECT_TYPES)
+
+    def spawn(self, effect_type, effect):
+        effects = getattr(self, effect_type)
+        if len(effects) >= self.limits[effect_type]:
+            return None
+        effects.append(effect)
+        return effect
+
+    def spawn_spark(self, pos, angle, scale, speed, color=(255, 255, 255)):
+        return self.spawn('sparks', Spark(pos, angle, scale, speed, color))
+
+    def spawn_circle(self, pos, radius, width, width_decay, speed, speed_decay, color):
+        return self.spawn('circles', CircleEffect(pos, radius, width, width_decay, speed, speed_decay, color))
+
+    def spawn_square(self, pos, angle, speed, size, decay):
+        return self.spawn('squares', SquareEffect(pos, angle, speed, size, decay))
+
+    def spawn_line(self, line, target, color, speed, duration):
+        return self.spawn('lines', LineEffect(line, target, color, speed, duration))
+
+    # squares
+
+    def update_squares(self):
+        start = time.perf_counter_ns()
+        alive = 0
+        for square in self.squares:
+            square.y += square.speed
+            square.angle += square.speed * square.decay
+            square.size -= square.decay
+            if square.size >= 1:
+                self.squares[alive] = square
+                alive += 1
+        del self.squares[alive:]
+        self.timings['squares'] += time.perf_counter_ns() - start
+
+    def draw_squares(self, surf, scroll, color):
+        start = time.perf_counter_ns()
+        for square in self.squares:
+            c, s = angle_lookup(square.angle)
+            c *= square.size
+            s *= square.size
+            y = square.y - scroll
+            points = [[square.x + c, y + s], [square.x - s, y + c], [square.x - c, y - s], [square.x + s, y - c]]
+            pygame.draw.polygon(surf, color, points, 2)
+        self.timings['squares'] += time.perf_counter_ns() - start
+
+    # laser charge lines (these are in screen space and go onto an AlphaLayer)
+
+    def update_lines(self):
+        start = time.perf_counter_ns()
+        alive = 0
+        for line in self.lines:
+            line.start[0] += (line.target_start[0] - line.start[0]) / line.speed
+            line.start[1] += (line.target_start[1] - line.start[1]) / line.speed
+            line.end[0] += (line.target_end[0] - line.end[0]) / line.speed
+            line.end[1] += (line.target_end[1] - line.end[1]) / line.speed
+            line.life -= 1
+            if line.life > 0:
+                self.lines[alive] = line
+                alive += 1
+        del self.lines[alive:]
+        self.timings['lines'] += time.perf_counter_ns() - start
+
+    def draw_lines(self, layer):
+        start = time.perf_counter_ns()
+        for line in self.lines:
+            opacity = int(255 * (line.life / line.duration))
+            layer.line((line.color[0], line.color[1], line.color[2], opacity), line.start, line.end)
+        self.timings['lines'] += time.perf_counter_ns() - start
+
+    # expanding rings
+
+    def update_circles(self):
+        start = time.perf_counter_ns()
+        alive = 0
+        for circle in self.circles:
+            circle.radius += circle.speed
+            circle.width -= circle.width_decay
+            circle.speed -= circle.speed_decay
+            if circle.width >= 1:
+                self.circles[alive] = circle
+                alive += 1
+        del self.circles[alive:]
+        self.timings['circles'] += time.perf_counter_ns() - start
+
+    def draw_circles(self, surf, scroll):
+        start = time.perf_counter_ns()
+        for circle in self.circles:
+            pygame.draw.circle(surf, circle.color, [int(circle.x), int(circle.y - scroll)], int(circle.radius), int(circle.width))
+        self.timings['circles'] += time.perf_counter_ns() - start
+
+    # sparks
+
+    def update_sparks(self):
+        start = time.perf_counter_ns()
+        alive = 0
+        for spark in self.sparks:
+            c, s = angle_lookup(spark.angle)
+            spark.x += c * spark.speed
+            spark.y += s * spark.speed
+            spark.speed -= 0.5
+            if spark.speed > 0:
+                self.sparks[alive] = spark
+                alive += 1
+        del self.sparks[alive:]
+        self.timings['sparks'] += time.perf_counter_ns() - start
+
+    def draw_sparks(self, surf, scroll):
+        start = time.perf_counter_ns()
+        for spark in self.sparks:
+            c, s = angle_lookup(spark.angle)
+            length = spark.speed * spark.scale
+            y = spark.y - scroll
+            points = [
+                [spark.x + c * 2 * length, y + s * 2 * length],
+                [spark.x - s * 0.3 * length, y + c * 0.3 * length],
+                [spark.x - c * length, y - s * length],
+                [spark.x + s * 0.3 * length, y - c * 0.3 * length],
+            ]
+            pygame.draw.polygon(surf, spark.color, points)
+        self.timings['sparks'] += time.perf_counter_ns() - start
@@ -1,6 +1,8 @@
 import pygame, math, os, json
+from collections import OrderedDict
 from pygame.locals import *
 #from data.scripts.core_funcs import *
+from data.core_funcs import read_f, write_f
 
 global e_colorkey
 e_colorkey = (255,255,255)
@@ -8,6 +10,7 @@ e_colorkey = (255,255,255)
 def set_global_colorkey(colorkey):
     global e_colorkey
     e_colorkey = colorkey
+    tint_cache.clear()
 
 KNOWN_TAGS = ['loop']
 
@@ -21,6 +24,64 @@ def collision_test(object_1,object_list):
             collision_list.append(obj)
     return collision_list
 
+# static broadphase for physics_obj.move: platforms, ramps and thin platforms get registered once
+# into a spatial hash of cell_size squares, and queries hand back list indexes in registration order
+# so move() sees the same blocks in the same order as the plain list scan
+class CollisionGrid(object):
+
+    def __init__(self, cell_size=64, platforms=(), ramps=(), thin_platforms=()):
+        self.cell_size = cell_size
+        self.platforms = []
+        self.ramps = []
+        self.thin_platforms = []
+        self.cells = {'platforms': {}, 'ramps': {}, 'thin_platforms': {}}
+        for platform in platforms:
+            self.add_platform(platform)
+        for ramp in ramps:
+            self.add_ramp(ramp)
+        for platform in thin_platforms:
+            self.add_thin_platform(platform)
+
+    def cell_range(self, rect):
+        cs = self.cell_size
+        return (range(rect.left // cs, max(rect.left, rect.right - 1) // cs + 1),
+                range(rect.top // cs, max(rect.top, rect.bottom - 1) // cs + 1))
+
+    def register(self, kind, rect, index):
+        cells = self.cells[kind]
+        xs, ys = self.cell_range(rect)
+        for x in xs:
+            for y in ys:
+                cells.setdefault((x, y), []).append(index)
+
+    def add_platform(self, rect):
+        self.register('platforms', rect, len(self.platforms))
+        self.platforms.append(rect)
+
+    # ramps look like [ramp type, rect]
+    def add_ramp(self, ramp):
+        self.register('ramps', ramp[1], len(self.ramps))
+        self.ramps.append(ramp)
+
+    def add_thin_platform(self, rect):
+        self.register('thin_platforms', rect, len(self.thin_platforms))
+        self.thin_platforms.append(rect)
+
+    def query(self, kind, rect):
+        cells = self.cells[kind]
+        xs, ys = self.cell_range(rect)
+        found = set()
+        for x in xs:
+            for y in ys:
+                indexes = cells.get((x, y))
+                if indexes:
+                    found.update(indexes)
+        return sorted(found)
+
+    def collision_test(self, rect):
+        platforms = self.platforms
+        return [platforms[i] for i in self.query('platforms', rect) if platforms[i].colliderect(rect)]
+
 # 2d physics object
 class physics_obj(object):
 
@@ -31,7 +92,10 @@ class physics_obj(object):
         self.x = x
         self.y = y
 
-    def move(self, movement, platforms, ramps, thin_platforms):
+    # with a CollisionGrid the platforms/ramps/thin_platforms lists are ignored and the grid's are used
+    def move(self, movement, platforms, ramps, thin_platforms, grid=None):
+        if grid != None:
+            return self.grid_move(movement, grid)
         orig_y = self.y
         self.x += movement[0]
         self.rect.x = int(self.x)
@@ -94,6 +158,82 @@ class physics_obj(object):
                     self.y = self.rect.y
         return collision_types
 
+    # same steps as move(), but every list scan only looks at the grid cells the rect is in.
+    # ramps and thin platforms can push the rect into new cells, so those get re-queried after every push
+    def grid_move(self, movement, grid):
+        orig_y = self.y
+        self.x += movement[0]
+        self.rect.x = int(self.x)
+        block_hit_list = grid.collision_test(self.rect)
+        collision_types = {'top':False,'bottom':False,'right':False,'left':False,'slant_bottom':False,'data':[]}
+        for block in block_hit_list:
+            markers = [False,False,False,False]
+            if movement[0] > 0:
+                self.rect.right = block.left
+                collision_types['right'] = True
+                markers[0] = True
+            elif movement[0] < 0:
+                self.rect.left = block.right
+                collision_types['left'] = True
+                markers[1] = True
+            collision_types['data'].append([block,markers])
+            self.x = self.rect.x
+        self.y += movement[1]
+        self.rect.y = int(self.y)
+        block_hit_list = grid.collision_test(self.rect)
+        for block in block_hit_list:
+            markers = [False,False,False,False]
+            if movement[1] > 0:
+                self.rect.bottom = block.top
+                collision_types['bottom'] = True
+                markers[2] = True
+            elif movement[1] < 0:
+                self.rect.top = block.bottom
+                collision_types['top'] = True
+                markers[3] = True
+            collision_types['data'].append([block,markers])
+            self.change_y = 0
+            self.y = self.rect.y
+        candidates = grid.query('ramps', self.rect)
+        pos = 0
+        while pos < len(candidates):
+            index = candidates[pos]
+            pos += 1
+            ramp = grid.ramps[index]
+            if self.rect.colliderect(ramp[1]):
+                if ramp[0] == 1: # up-right ramp
+                    ramp_pos = self.rect.right - ramp[1].x
+                    ramp_pos = min(ramp_pos, ramp[1].width)
+                    ramp_pos = max(ramp_pos, 0)
+                    ramp_border = ramp[1].y + (ramp[1].height - ramp_pos)
+                elif ramp[0] == 2:
+                    ramp_pos = self.rect.x - ramp[1].x
+                    ramp_pos = min(ramp_pos, ramp[1].width)
+                    ramp_pos = max(ramp_pos, 0)
+                    ramp_border = ramp[1].y + ramp_pos
+                else:
+                    continue
+                if self.rect.bottom > ramp_border:
+                    collision_types['bottom'] = True
+                    self.rect.bottom = ramp_border
+                    self.y = self.rect.y
+                    candidates = [i for i in grid.query('ramps', self.rect) if i > index]
+                    pos = 0
+        candidates = grid.query('thin_platforms', self.rect)
+        pos = 0
+        while pos < len(candidates):
+            index = candidates[pos]
+            pos += 1
+            platform = grid.thin_platforms[index]
+            if self.rect.colliderect(platform):
+                if orig_y + self.rect.height - 1 < platform.y:
+                    self.rect.bottom = platform.y
+                    collision_types['bottom'] = True
+                    self.y = self.rect.y
+                    candidates = [i for i in grid.query('thin_platforms', self.rect) if i > index]
+                    pos = 0
+        return collision_types
+
 # 3d collision detection
 # todo: add 3d physics-based movement
 
@@ -171,8 +311,8 @@ class entity(object):
         self.obj.rect.x = x
         self.obj.rect.y = y
 
-    def move(self, momentum, platforms, ramps, thin_platforms):
-        collisions = self.obj.move(momentum, platforms, ramps, thin_platforms)
+    def move(self, momentum, platforms, ramps, thin_platforms, grid=None):
+        collisions = self.obj.move(momentum, platforms, ramps, thin_platforms, grid)
         self.x = self.obj.x
         self.y = self.obj.y
         return collisions
@@ -267,36 +407,69 @@ class entity(object):
         else:
             return flip(animation_database[self.animation[self.animation_frame]],self.flip)
 
+    # the returned image comes out of transform_cache and is shared, so don't draw on it
     def get_drawn_img(self):
-        image_to_render = None
+        image = None
         if self.animation == None:
-            if self.image != None:
-                image_to_render = flip(self.image,self.flip).copy()
+            image = self.image
         else:
-            image_to_render = flip(animation_database[self.animation[self.animation_frame]],self.flip).copy()
-        if image_to_render != None:
-            center_x = image_to_render.get_width()/2
-            center_y = image_to_render.get_height()/2
-            image_to_render = pygame.transform.rotate(image_to_render,self.rotation)
-            if self.alpha != None:
-                image_to_render.set_alpha(self.alpha)
-            return image_to_render, center_x, center_y
+            image = animation_database[self.animation[self.animation_frame]]
+        if image != None:
+            return transform_cache.get(image,self.flip,self.rotation,self.alpha)
 
     def display(self,surface,scroll):
-        image_to_render = None
-        if self.animation == None:
-            if self.image != None:
-                image_to_render = flip(self.image,self.flip).copy()
-        else:
-            image_to_render = flip(animation_database[self.animation[self.animation_frame]],self.flip).copy()
-        if image_to_render != None:
-            center_x = image_to_render.get_width()/2
-            center_y = image_to_render.get_height()/2
-            image_to_render = pygame.transform.rotate(image_to_render,self.rotation)
-            if self.alpha != None:
-                image_to_render.set_alpha(self.alpha)
+        drawn = self.get_drawn_img()
+        if drawn != None:
+            image_to_render, center_x, center_y = drawn
             blit_center(surface,image_to_render,(int(self.x)-scroll[0]+self.offset[0]+center_x,int(self.y)-scroll[1]+self.offset[1]+center_y))
 
+# flipped + rotated + alpha'd entity images, keyed by (image id, flip, rotation, alpha)
+# rotations get snapped to multiples of quantum degrees (0 keeps them exact) so slowly turning
+# entities keep hitting the same entries. least recently used entries get dropped past max_size
+class TransformCache(object):
+
+    def __init__(self, max_size=2048, quantum=1):
+        self.max_size = max_size
+        self.quantum = quantum
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image, flip_x, rotation, alpha):
+        if self.quantum:
+            rotation = round(rotation / self.quantum) * self.quantum
+        rotation %= 360
+        key = (id(image), bool(flip_x), rotation, alpha)
+        entry = self.surfaces.get(key)
+        # the source image is kept in the entry so a recycled id can't hand back the wrong surface
+        if (entry is not None) and (entry[0] is image):
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        image_to_render = flip(image,flip_x)
+        center_x = image_to_render.get_width()/2
+        center_y = image_to_render.get_height()/2
+        image_to_render = pygame.transform.rotate(image_to_render,rotation)
+        if alpha != None:
+            image_to_render.set_alpha(alpha)
+        drawn = (image_to_render, center_x, center_y)
+        self.surfaces[key] = (image, drawn)
+        self.surfaces.move_to_end(key)
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return drawn
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+global transform_cache
+transform_cache = TransformCache()
+
 # animation stuff
 
 global animation_database
@@ -325,12 +498,20 @@ def get_frame(ID):
     global animation_database
     return animation_database[ID]
 
-def load_animations2(path):
-    global animation_higher_database, e_colorkey
+def read_anim_config(path):
     try:
-        anim_config = json.loads(read_f(path + '/anim_conf.json'))
+        return json.loads(read_f(path + '/anim_conf.json'))
     except FileNotFoundError:
-        anim_config = {}
+        return {}
+
+# only touches the file when an animation got added, instead of rewriting it on every startup
+def write_anim_config(path, anim_config):
+    if anim_config != read_anim_config(path):
+        write_f(path + '/anim_conf.json', json.dumps(anim_config))
+
+def load_animations2(path):
+    global animation_higher_database, e_colorkey
+    anim_config = read_anim_config(path)
     animation_sets = os.listdir(path)
     for animation_set in animation_sets:
         if len(animation_set.split('.')) == 1:
@@ -344,7 +525,9 @@ def load_animations2(path):
                 if animation_set not in animation_higher_database:
                     animation_higher_database[animation_set] = {}
                 animation_higher_database[animation_set][animation] = [anim.copy(), anim_config[path_2]['tags']]
-    write_f(path + '/anim_conf.json', json.dumps(anim_config))
+    write_anim_config(path, anim_config)
+    # cached flips and rotations belong to the frames that were just replaced
+    transform_cache.clear()
 
 # particles
 
@@ -376,7 +559,45 @@ def load_particle_images(path):
             particle_images[folder] = images.copy()
         except:
             pass
-
+    tint_cache.clear()
+
+# recolored particle frames, keyed by (particle type, frame index, color)
+# least recently used entries get dropped once max_size is reached
+class TintCache(object):
+
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, particle_type, frame, color):
+        key = (particle_type, frame, tuple(color))
+        surf = self.surfaces.get(key)
+        if surf is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = swap_color(particle_images[particle_type][frame],(255,255,255),color)
+        self.surfaces[key] = surf
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surf
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+global tint_cache
+tint_cache = TintCache()
+
+# one particle as its own object. the game keeps its particles in particles.ParticlePool, which takes
+# these through append(). this class stays standalone instead of wrapping a pool slot: the pool
+# compacts its arrays every update so slots move, and ParticleList (no numpy) runs on these objects
 class particle(object):
 
     def __init__(self,loc,particle_type,motion,decay_rate,start_frame,custom_color=None, physics=False):
@@ -401,7 +622,7 @@ class particle(object):
             if self.color == None:
                 blit_center(surface,particle_images[self.type][int(self.frame)],(self.x-scroll[0],self.y-scroll[1]))
             else:
-                blit_center(surface,swap_color(particle_images[self.type][int(self.frame)],(255,255,255),self.color),(self.x-scroll[0],self.y-scroll[1]))
+                blit_center(surface,tint_cache.get(self.type,int(self.frame),self.color),(self.x-scroll[0],self.y-scroll[1]))
 
     def update(self, dt):
         self.frame += self.decay_rate * dt
@@ -0,0 +1,528 @@
+import pygame, random, math, hashlib
+import data.entities as e
+import data.text as text
+from data.platforms import PlatformStore
+from data.collisions import PlatformCollider
+from data.particles import new_pool
+from data.effects import Effects
+from data.compositor import Compositor
+from data.atlas import load_atlas
+from data.profiler import profiler
+from data.core_funcs import *
+
+# all of Line Ball's game state, advanced with step() and drawn with render()
+# step() is one 1/60s tick and never touches the window, the mixer or the global random module, so it can run headless
+
+BORDER_WIDTH = 70
+DISPLAY_SIZE = (275, 400)
+SCREEN_SIZE = (DISPLAY_SIZE[0] * 2 + 2 * BORDER_WIDTH, DISPLAY_SIZE[1] * 2)
+
+INPUT_CLICK = 1
+INPUT_RESTART = 2
+
+background_color = (13, 20, 33)
+background_polygon_color = (24, 34, 46)
+line_placing_color = (90, 140, 170)
+line_width = 3
+player_color = (90, 210, 255)
+
+fonts = []
+
+# the difficulty curve: gravity, fall speed cap and bounce all grow with the score,
+# and lasers start showing up past laser_score with 1 in laser_odds * (1 + 2 * lasers on screen) odds
+DEFAULT_DIFFICULTY = {
+    'gravity': 0.05,
+    'gravity_score_scale': 30000,
+    'terminal_velocity': 1,
+    'terminal_velocity_score_scale': 3000,
+    'bounce_strength': 1,
+    'bounce_score_scale': 8000,
+    'laser_score': 300,
+    'laser_odds': 300,
+}
+
+# needs a display mode to be set first since the images get converted
+def load_assets():
+    if not load_atlas():
+        e.load_particle_images('data/images/particles')
+    e.set_global_colorkey((0, 0, 0))
+    fonts[:] = [text.Font('data/fonts/large_font.png', (255, 255, 255)),
+                text.Font('data/fonts/large_font.png', (0, 0, 1)),
+                text.Font('data/fonts/small_font.png', (255, 255, 255))]
+
+def mirror_angle(original, base):
+    dif = 180 - base
+    base = 180
+    new = (original + dif) % 360
+    dif = base - new
+    return original + dif * 2
+
+def dis_func(dis):
+    return math.sqrt(dis[0] ** 2 + dis[1] ** 2)
+
+class LineBallSim(object):
+
+    def __init__(self, seed=None, high_score=0, difficulty=None):
+        self.seed = seed
+        self.difficulty = dict(DEFAULT_DIFFICULTY)
+        if difficulty:
+            for key in difficulty:
+                if key not in DEFAULT_DIFFICULTY:
+                    raise KeyError('unknown difficulty setting %r' % key)
+            self.difficulty.update(difficulty)
+        self.rng = random.Random(seed)
+        self.width, self.height = DISPLAY_SIZE
+        self.high_score = high_score
+        self.frame = 0
+        self.events = []
+        self.mouse = [self.width // 2, 0]
+
+        self.particles = new_pool(limit=2000)
+        self.collider = PlatformCollider()
+        self.effects = Effects()
+
+        self.display = None
+        self.gui_display = None
+        self.compositor = None
+        self.alpha_layer = None
+
+        self.transition = 30
+        self.screen_shake = 0
+        self.game_text_loc = -120
+        self.end_text_loc = -220
+        self.reset()
+
+    def reset(self):
+        self.lasers = []
+        self.player_path = []
+        self.game_score = 0
+        self.end_game = False
+        self.particles.clear()
+        self.effects.clear()
+
+        self.platforms = PlatformStore()
+        self.platforms.add([[0, self.height - 1], [self.width, self.height - 1]], permanent=True)
+
+        self.last_point = [self.width // 2, self.height]
+        self.last_place = 50
+        self.scroll = 0
+
+        self.player_pos = [self.width // 2, self.height // 2]
+        self.player_velocity = [0, 0]
+        self.prev_player_pos = self.player_pos.copy()
+        self.prev_scroll = self.scroll
+        self.player_gravity = self.difficulty['gravity']
+        self.player_terminal_velocity = self.difficulty['terminal_velocity']
+        self.bounce_strength = self.difficulty['bounce_strength']
+        self.bounce_cooldown = 0
+
+    def step(self, inputs=()):
+        rng = self.rng
+        self.events = []
+        self.frame += 1
+        # where things were before this step, for render() to interpolate from
+        self.prev_player_pos = self.player_pos.copy()
+        self.prev_scroll = self.scroll
+
+        if self.transition > 0:
+            self.transition -= 1
+
+        if self.screen_shake > 0:
+            self.screen_shake -= 1
+
+        if not self.end_game:
+            if self.player_pos[1] - 200 < self.scroll:
+                self.scroll += (self.player_pos[1] - 200 - self.scroll) / 10
+
+        with profiler.scope('platforms'):
+            if (-self.scroll) - self.last_place > 50:
+                if rng.randint(1, 3) <= 2:
+                    base_y = self.scroll - 80
+                    base_x = rng.randint(0, self.width)
+                    new_line = [
+                        [base_x, base_y],
+                        [base_x + rng.randint(0, 200) - 100,
+                         base_y + rng.randint(0, 100) - 50]
+                    ]
+                    if dis_func((
+                        new_line[1][0] - new_line[0][0],
+                        new_line[1][1] - new_line[0][1]
+                    )) > 30:
+                        new_line.sort()
+                        self.platforms.add(new_line)
+
+                self.last_place += 50
+
+            self.platforms.retire(self.scroll, self.height)
+
+        self.game_score = max(
+            self.game_score,
+            -(self.player_pos[1] - self.height // 2)
+        )
+
+        if int(self.game_score) > self.high_score:
+            self.high_score = int(self.game_score)
+
+        difficulty = self.difficulty
+        self.player_gravity = difficulty['gravity'] + self.game_score / difficulty['gravity_score_scale']
+        self.player_terminal_velocity = difficulty['terminal_velocity'] + self.game_score / difficulty['terminal_velocity_score_scale']
+        self.bounce_strength = difficulty['bounce_strength'] + self.game_score / difficulty['bounce_score_scale']
+
+        if self.end_game:
+            self.scroll += (-self.scroll) / 100
+
+        # Square effects
+        with profiler.scope('squares'):
+            if rng.randint(1, 60) == 1:
+                self.effects.spawn_square(
+                    [rng.randint(0, self.width), -80 + self.scroll],
+                    rng.randint(0, 359),
+                    rng.randint(10, 30) / 20,
+                    rng.randint(15, 40),
+                    rng.randint(10, 30) / 500
+                )
+
+            self.effects.update_squares()
+        with profiler.scope('lines'):
+            self.effects.update_lines()
+        with profiler.scope('circles'):
+            self.effects.update_circles()
+        with profiler.scope('sparks'):
+            self.effects.update_sparks()
+
+        self.player_path = self.player_path[-50:]
+
+        # Lasers
+        with profiler.scope('lasers'):
+            if self.game_score > self.difficulty['laser_score']:
+                if rng.randint(1, self.difficulty['laser_odds'] * (1 + len(self.lasers) * 2)) == 1:
+                    self.lasers.append([
+                        rng.randint(0, self.width),
+                        rng.randint(90, 150),
+                        20
+                    ])
+
+            for i, laser in sorted(enumerate(self.lasers), reverse=True):
+                self.update_laser(i, laser)
+
+        # Sparks coming off the platforms on screen
+        with profiler.scope('platform sparks'):
+            for platform in self.platforms.visible(self.scroll, self.height):
+                if rng.randint(0, 10) == 0:
+                    color = rng.randint(150, 220)
+                    self.effects.spawn_spark(
+                        rng.choice(platform),
+                        rng.randint(0, 359),
+                        rng.randint(7, 10) / 10,
+                        5 * rng.randint(5, 10) / 10,
+                        (color, color, color)
+                    )
+
+        # Player particle trail
+        self.particles.spawn(
+            self.player_pos.copy(), 'p',
+            [rng.randint(0, 20) / 40 - 0.25,
+             rng.randint(0, 10) / 15 - 1],
+            0.2,
+            rng.randint(0, 30) / 10,
+            player_color
+        )
+
+        with profiler.scope('collisions'):
+            self.update_player()
+
+        with profiler.scope('particles'):
+            self.particles.update(1)
+
+        # Animate GUI positions
+        if self.end_game:
+            self.game_text_loc += (-120 - self.game_text_loc) / 20
+            self.end_text_loc += (200 - self.end_text_loc) / 20
+        else:
+            self.game_text_loc += (6 - self.game_text_loc) / 10
+            self.end_text_loc += (-220 - self.end_text_loc) / 20
+
+        for event, x, y in inputs:
+            self.handle_input(event, x, y)
+
+    def update_laser(self, i, laser):
+        rng = self.rng
+        left = max(0, laser[0] - laser[1] // 2)
+        right = min(self.width, laser[0] + laser[1] // 2)
+
+        center_line = [[laser[0], 0], [laser[0], self.height]]
+
+        if laser[2] % 12 == 0:
+            self.events.append('laser_charge')
+            self.effects.spawn_line(
+                [[left, 0], [left, self.height]],
+                center_line,
+                (190, 40, 100), 20, 30
+            )
+            self.effects.spawn_line(
+                [[right, 0], [right, self.height]],
+                center_line,
+                (190, 40, 100), 20, 30
+            )
+
+        laser[2] += 1
+
+        if laser[2] > 180:
+            self.lasers.pop(i)
+            self.events.append('laser_explode')
+
+            if left < self.player_pos[0] < right:
+                if self.player_pos[0] > laser[0]:
+                    self.player_velocity[0] += 4
+                else:
+                    self.player_velocity[0] -= 4
+
+                for _ in range(30):
+                    self.effects.spawn_spark(
+                        self.player_pos,
+                        rng.randint(0, 359),
+                        rng.randint(7, 10) / 10 * 3,
+                        9 * rng.randint(5, 10) / 10,
+                        (170, 170, 170)
+                    )
+
+                    a = rng.randint(0, 359)
+                    s = rng.randint(20, 50) / 10
+                    x = math.cos(math.radians(a)) * s
+                    y = math.sin(math.radians(a)) * s
+                    self.particles.spawn(
+                        self.player_pos.copy(),
+                        'p', [x, y],
+                        0.1,
+                        rng.randint(0, 20) / 10,
+                        (170, 170, 170)
+                    )
+                self.screen_shake = 8
+
+            # debris
+            for _ in range(300):
+                if rng.randint(1, 2) == 1:
+                    pos_x = left
+                    vel = [4 + rng.randint(0, 20) / 10,
+                           rng.randint(0, 10) / 10 - 3]
+                else:
+                    pos_x = right
+                    vel = [-(4 + rng.randint(0, 20) / 10),
+                           rng.randint(0, 10) / 10 - 3]
+
+                pos_y = rng.randint(0, self.height + 30) + self.scroll - 30
+
+                self.particles.spawn(
+                    [pos_x, pos_y], 'p',
+                    vel, 0.2,
+                    rng.randint(0, 20) / 10,
+                    (160, 40, 80)
+                )
+
+    def update_player(self):
+        rng = self.rng
+        player_pos = self.player_pos
+        player_velocity = self.player_velocity
+        start_pos = player_pos.copy()
+
+        # gravity / physics
+        player_velocity[1] = min(self.player_terminal_velocity, player_velocity[1] + self.player_gravity)
+        player_pos[0] += player_velocity[0]
+        player_pos[1] += player_velocity[1]
+        player_velocity[1] = normalize(player_velocity[1], 0.02)
+
+        self.player_path.append(player_pos.copy())
+
+        if self.bounce_cooldown > 0:
+            self.bounce_cooldown -= 1
+
+        # Collision with platforms
+        for platform in self.collider.crossings(self.platforms, start_pos, player_pos):
+            if 0 < player_pos[0] < self.width:
+                if self.bounce_cooldown == 0:
+                    self.events.append('bounce')
+                    angle = math.atan2(
+                        platform[1][1] - platform[0][1],
+                        platform[1][0] - platform[0][0]
+                    )
+                    normal = angle - math.pi * 0.5
+                    bounce_angle = math.radians(
+                        mirror_angle(
+                            math.degrees(math.atan2(
+                                -player_velocity[1], -player_velocity[0]
+                            )),
+                            math.degrees(normal)
+                        ) % 360
+                    )
+                    mag = dis_func(player_velocity) + 1
+                    player_velocity[0] = math.cos(bounce_angle) * mag
+                    player_velocity[1] = math.sin(bounce_angle) * mag
+                    player_velocity[1] -= 2 * self.bounce_strength
+
+                    # sparks
+                    for _ in range(rng.randint(4, 6)):
+                        spark_angle = math.degrees(normal) + rng.randint(0, 180) - 90
+                        self.effects.spawn_spark(
+                            player_pos,
+                            spark_angle,
+                            (mag) / 3 * rng.randint(7, 10) / 10,
+                            mag * 2 * rng.randint(5, 10) / 10
+                        )
+                    self.bounce_cooldown = 3
+
+        # Death if out of bounds
+        if player_pos[0] < 0 or player_pos[0] > self.width:
+            if not self.end_game:
+                self.events.append('death')
+                self.events.append('music_pause')
+                self.effects.spawn_circle(player_pos, 6, 6, 0.15, 10, 0.2, (190, 40, 100))
+                self.effects.spawn_circle(player_pos, 6, 6, 0.05, 5, 0.04, (190, 40, 100))
+                self.screen_shake = 12
+
+            self.end_game = True
+
+    def handle_input(self, event, x, y):
+        if event == INPUT_RESTART and self.end_game:
+            self.events.append('restart')
+            self.events.append('music_play')
+            self.transition = 30
+            self.reset()
+
+        if event == INPUT_CLICK and not self.end_game:
+            new_line = [self.last_point, [x, y + self.scroll]]
+            new_line.sort()
+            self.platforms.add(new_line)
+            self.last_point = [x, y + self.scroll]
+
+            self.effects.spawn_circle([x, y + self.scroll], 4, 4, 0.2, 4, 0.3, (255, 255, 255))
+            self.events.append('place')
+
+    # fingerprint of everything step() touches, for checking that two runs stayed in lockstep
+    def state_hash(self):
+        state = repr((
+            self.frame, self.player_pos, self.player_velocity, self.scroll, self.game_score,
+            self.end_game, self.last_point, self.lasers, list(self.platforms),
+            len(self.particles), len(self.effects), self.rng.getstate()
+        ))
+        return hashlib.sha1(state.encode()).hexdigest()[:16]
+
+    # alpha is how far the clock is between the previous step and this one (1 draws this step as is)
+    def render(self, target, alpha=1):
+        if self.display is None:
+            self.display = pygame.Surface(DISPLAY_SIZE)
+            self.gui_display = pygame.Surface(DISPLAY_SIZE)
+            self.gui_display.set_colorkey((0, 0, 0))
+            self.alpha_layer = AlphaLayer(DISPLAY_SIZE)
+        if (self.compositor is None) or (self.compositor.screen is not target):
+            self.compositor = Compositor(target, self.display, self.gui_display, BORDER_WIDTH, background_color)
+
+        display = self.display
+        gui_display = self.gui_display
+        scroll = self.prev_scroll + (self.scroll - self.prev_scroll) * alpha
+        effects = self.effects
+        line_color = (190, 197, 208) if self.end_game else (255, 255, 255)
+
+        display.fill(background_color)
+        gui_display.fill((0, 0, 0))
+
+        with profiler.scope('draw squares'):
+            effects.draw_squares(display, scroll, background_polygon_color)
+        with profiler.scope('draw lines'):
+            effects.draw_lines(self.alpha_layer)
+            self.alpha_layer.flush(display)
+        with profiler.scope('draw circles'):
+            effects.draw_circles(display, scroll)
+        with profiler.scope('draw sparks'):
+            effects.draw_sparks(display, scroll)
+
+        # Draw placing preview line
+        if not self.end_game:
+            pygame.draw.line(
+                display,
+                line_placing_color,
+                [self.last_point[0], self.last_point[1] - scroll],
+                self.mouse
+            )
+
+        # Player path line
+        if len(self.player_path) > 2:
+            mod_path = [[p[0], p[1] - scroll] for p in self.player_path]
+            pygame.draw.lines(display, line_placing_color, False, mod_path)
+
+        # Lasers
+        with profiler.scope('draw lasers'):
+            for laser in self.lasers:
+                left = max(0, laser[0] - laser[1] // 2)
+                right = min(self.width, laser[0] + laser[1] // 2)
+                pygame.draw.line(display, (190, 40, 100), (left, 0), (left, self.height))
+                pygame.draw.line(display, (190, 40, 100), (right, 0), (right, self.height))
+
+        # Platforms
+        with profiler.scope('draw platforms'):
+            for platform in self.platforms.visible(scroll, self.height):
+                pygame.draw.line(display, line_color,
+                                 [platform[0][0], platform[0][1] - scroll],
+                                 [platform[1][0], platform[1][1] - scroll],
+                                 line_width)
+                pygame.draw.circle(display, line_color,
+                                   [platform[0][0], platform[0][1] - scroll], 6, 2)
+                pygame.draw.circle(display, line_color,
+                                   [platform[1][0], platform[1][1] - scroll], 6, 2)
+
+        with profiler.scope('draw particles'):
+            self.particles.draw(display, [0, scroll])
+
+        # Draw player on top
+        player_x = self.prev_player_pos[0] + (self.player_pos[0] - self.prev_player_pos[0]) * alpha
+        player_y = self.prev_player_pos[1] + (self.player_pos[1] - self.prev_player_pos[1]) * alpha
+        draw_pos = [int(player_x), int(player_y - scroll)]
+        pygame.draw.circle(display, (0, 0, 0), [draw_pos[0] + 1, draw_pos[1] + 2], 7)
+        pygame.draw.circle(display, (255, 255, 255), draw_pos, 6)
+        pygame.draw.circle(display, player_color, draw_pos, 5)
+
+        with profiler.scope('gui text'):
+            self.render_gui(gui_display)
+
+        if profiler.overlay:
+            profiler.draw_overlay(gui_display, fonts[2], (4, 60))
+
+        # Final draw to screen
+        offset = [0, 0]
+        if self.screen_shake:
+            offset[0] += random.randint(-5, 5)
+            offset[1] += random.randint(-5, 5)
+
+        with profiler.scope('compose'):
+            self.compositor.compose(display, gui_display, offset, int(255 * self.transition / 30))
+
+    def render_gui(self, gui_display):
+        font, font2 = fonts[:2]
+        game_score = int(self.game_score)
+        high_score = int(self.high_score)
+
+        # SCORE & SMALL HIGH SCORE
+        font.render(f'score: {game_score}', gui_display, (self.game_text_loc, 4))
+
+        hs_text = f'high: {high_score}'
+        hs_x = self.width - font.width(hs_text) - 6
+        font2.render(hs_text, gui_display, (hs_x, 4))
+
+        # BIG HIGH SCORE
+        big_hs_text = "BEST: " + str(high_score)
+        big_x = self.width // 2 - font.width(big_hs_text) // 2
+        font.render(big_hs_text, gui_display, (big_x, 40))
+
+        # End text
+        font2.render(str(game_score), gui_display,
+                     (self.width // 2 - font.width(str(game_score)) // 2,
+                      self.end_text_loc + 4))
+        font2.render('press R', gui_display,
+                     (self.width // 2 - font.width('press R') // 2,
+                      self.end_text_loc + 28))
+
+        font.render(str(game_score), gui_display,
+                    (self.width // 2 - font.width(str(game_score)) // 2,
+                     self.end_text_loc))
+        font.render('press R', gui_display,
+                    (self.width // 2 - font.width('press R') // 2,
+                     self.end_text_loc + 24))
@@ -0,0 +1,174 @@
+import data.entities as e
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# particles stored as parallel arrays instead of one object each
+# spawn() takes the same arguments as entities.particle, and append() copies a particle object into a slot
+
+FIELDS = [('x', 'f8'), ('y', 'f8'), ('motion_x', 'f8'), ('motion_y', 'f8'), ('frame', 'f8'),
+          ('decay_rate', 'f8'), ('type', 'i4'), ('color', 'i4'), ('physics', '?')]
+
+class ParticlePool(object):
+
+    def __init__(self, limit=None, capacity=1024):
+        self.limit = limit
+        self.count = 0
+        self.types = []
+        self.colors = []
+        self.type_ids = {}
+        self.color_ids = {}
+        self.frame_counts = numpy.zeros(0, dtype=numpy.float64)
+        self.allocate(capacity)
+
+    def __len__(self):
+        return self.count
+
+    def allocate(self, capacity):
+        for name, dtype in FIELDS:
+            array = numpy.zeros(capacity, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                array[:self.count] = old[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def arrays(self):
+        return [getattr(self, name) for name, dtype in FIELDS]
+
+    def type_id(self, particle_type):
+        if particle_type not in self.type_ids:
+            self.type_ids[particle_type] = len(self.types)
+            self.types.append(particle_type)
+            self.frame_counts = numpy.append(self.frame_counts, len(e.particle_images[particle_type]))
+        return self.type_ids[particle_type]
+
+    def color_id(self, color):
+        if color is None:
+            return -1
+        color = tuple(color)
+        if color not in self.color_ids:
+            self.color_ids[color] = len(self.colors)
+            self.colors.append(color)
+        return self.color_ids[color]
+
+    def spawn(self, loc, particle_type, motion, decay_rate, start_frame, custom_color=None, physics=False):
+        if self.count == self.capacity:
+            self.grow()
+        i = self.count
+        self.x[i] = loc[0]
+        self.y[i] = loc[1]
+        self.motion_x[i] = motion[0]
+        self.motion_y[i] = motion[1]
+        self.frame[i] = start_frame
+        self.decay_rate[i] = decay_rate
+        self.type[i] = self.type_id(particle_type)
+        self.color[i] = self.color_id(custom_color)
+        self.physics[i] = physics
+        self.count += 1
+
+    def append(self, p):
+        self.spawn([p.x, p.y], p.type, p.motion, p.decay_rate, p.frame, p.color, p.physics)
+
+    def grow(self):
+        self.allocate(self.capacity * 2)
+
+    def clear(self):
+        self.count = 0
+
+    def truncate(self, limit):
+        # keeps the newest particles, same as particles[-limit:]
+        if self.count > limit:
+            drop = self.count - limit
+            for array in self.arrays():
+                array[:limit] = array[drop:self.count]
+            self.count = limit
+
+    def update(self, dt):
+        if self.limit is not None:
+            self.truncate(self.limit)
+        n = self.count
+        if not n:
+            return
+        frame = self.frame[:n]
+        frame += self.decay_rate[:n] * dt
+        moving = ~self.physics[:n]
+        self.x[:n] += numpy.where(moving, self.motion_x[:n] * dt, 0)
+        self.y[:n] += numpy.where(moving, self.motion_y[:n] * dt, 0)
+
+        alive = frame < self.frame_counts[self.type[:n]] + 1
+        if not alive.all():
+            kept = int(numpy.count_nonzero(alive))
+            for array in self.arrays():
+                array[:kept] = array[:n][alive]
+            self.count = kept
+
+    def image(self, type_id, frame, color_id):
+        if color_id == -1:
+            img = e.particle_images[self.types[type_id]][frame]
+        else:
+            img = e.tint_cache.get(self.types[type_id], frame, self.colors[color_id])
+        return img, int(img.get_width() / 2), int(img.get_height() / 2)
+
+    def draw(self, surface, scroll):
+        n = self.count
+        if not n:
+            return
+        types = self.type[:n]
+        # newest first so the oldest particles end up on top, like the old reversed list sweep
+        visible = numpy.flatnonzero(self.frame[:n] < self.frame_counts[types])[::-1]
+        lookup = {}
+        blits = []
+        for x, y, type_id, frame, color_id in zip(
+                (self.x[visible] - scroll[0]).tolist(),
+                (self.y[visible] - scroll[1]).tolist(),
+                types[visible].tolist(),
+                self.frame[visible].astype(numpy.int32).tolist(),
+                self.color[visible].tolist()):
+            key = (type_id, frame, color_id)
+            entry = lookup.get(key)
+            if entry is None:
+                entry = self.image(type_id, frame, color_id)
+                lookup[key] = entry
+            blits.append((entry[0], (x - entry[1], y - entry[2])))
+        surface.blits(blits, False)
+
+# same interface on top of plain particle objects, used when numpy isn't around
+
+class ParticleList(object):
+
+    def __init__(self, limit=None):
+        self.limit = limit
+        self.particles = []
+
+    def __len__(self):
+        return len(self.particles)
+
+    def spawn(self, loc, particle_type, motion, decay_rate, start_frame, custom_color=None, physics=False):
+        self.particles.append(e.particle(loc, particle_type, motion, decay_rate, start_frame, custom_color, physics))
+
+    def append(self, p):
+        self.particles.append(p)
+
+    def clear(self):
+        self.particles = []
+
+    def truncate(self, limit):
+        if len(self.particles) > limit:
+            self.particles = self.particles[-limit:]
+
+    def update(self, dt):
+        if self.limit is not None:
+            self.truncate(self.limit)
+        self.particles = [p for p in self.particles if p.update(dt)]
+
+    def draw(self, surface, scroll):
+        for p in reversed(self.particles):
+            p.draw(surface, scroll)
+
+def new_pool(limit=None):
+    if numpy is not None:
+        return ParticlePool(limit)
+    return ParticleList(limit)
@@ -0,0 +1,84 @@
+import os, threading
+
+# high score kept in memory and written out by a background thread
+# submit() only touches memory, the thread writes at most once per interval (newest score wins)
+# and every write goes to a temp file that gets renamed over the old one, so the file is never half written
+
+class HighScoreStore(object):
+
+    def __init__(self, path, interval=1.0):
+        self.path = path
+        self.interval = interval
+        self.high_score = self.load()
+        self.saved = self.high_score
+        self.writes = 0
+        self.dirty = False
+        self.urgent = False
+        self.running = True
+        self.condition = threading.Condition()
+        self.thread = threading.Thread(target=self.run, name='highscore', daemon=True)
+        self.thread.start()
+
+    def load(self):
+        if os.path.exists(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    return int(f.read().strip())
+            except:
+                return 0
+        return 0
+
+    def submit(self, score):
+        score = int(score)
+        if score <= self.high_score:
+            return False
+        with self.condition:
+            self.high_score = score
+            self.dirty = True
+        return True
+
+    # asks the thread to write now instead of waiting out the interval (game over)
+    def flush(self):
+        with self.condition:
+            if self.dirty:
+                self.urgent = True
+                self.condition.notify()
+
+    # final blocking write, for exit
+    def close(self):
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        self.thread.join()
+        self.write()
+
+    def run(self):
+        while True:
+            with self.condition:
+                if self.running and not self.urgent:
+                    self.condition.wait(self.interval)
+                if not self.running:
+                    return
+                self.urgent = False
+            self.write()
+
+    def write(self):
+        with self.condition:
+            if not self.dirty:
+                return
+            score = self.high_score
+            self.dirty = False
+        temp_path = self.path + '.tmp'
+        try:
+            with open(temp_path, 'w') as f:
+                f.write(str(score))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.path)
+        except OSError as exc:
+            print('Failed to save %s:' % self.path, exc)
+            with self.condition:
+                self.dirty = True
+            return
+        self.saved = score
+        self.writes += 1
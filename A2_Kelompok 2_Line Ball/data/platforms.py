@@ -0,0 +1,111 @@
+import math
+
+# platforms are stored in horizontal bands so that the game only has to look at
+# the lines around the player and the camera instead of every line ever placed
+
+class PlatformStore(object):
+
+    def __init__(self, band_height=64, retire_distance=800, pan_distance=2000):
+        self.band_height = band_height
+        self.retire_distance = retire_distance
+        self.pan_distance = pan_distance
+        self.lines = {}
+        self.bands = {}
+        self.permanent = set()
+        # retired lines within pan_distance of the live ones, only kept for drawing (the start of the
+        # game over pan scrolls back down over them)
+        self.retired = {}
+        self.retired_bands = {}
+        self.next_id = 0
+        self.version = 0
+
+    def __len__(self):
+        return len(self.lines)
+
+    def __iter__(self):
+        return iter(list(self.lines.values()))
+
+    def band_range(self, y_min, y_max):
+        return range(math.floor(y_min / self.band_height), math.floor(y_max / self.band_height) + 1)
+
+    def add_to_bands(self, bands, line_id, line):
+        for band in self.band_range(min(line[0][1], line[1][1]), max(line[0][1], line[1][1])):
+            if band not in bands:
+                bands[band] = []
+            bands[band].append(line_id)
+
+    def add(self, line, permanent=False):
+        line_id = self.next_id
+        self.next_id += 1
+        self.lines[line_id] = line
+        self.add_to_bands(self.bands, line_id, line)
+        if permanent:
+            self.permanent.add(line_id)
+        self.version += 1
+        return line
+
+    def clear(self):
+        self.lines = {}
+        self.bands = {}
+        self.permanent = set()
+        self.retired = {}
+        self.retired_bands = {}
+        self.version += 1
+
+    def query(self, y_min, y_max, retired=False):
+        found = set()
+        for band in self.band_range(y_min, y_max):
+            if band in self.bands:
+                found.update(self.bands[band])
+            if retired and (band in self.retired_bands):
+                found.update(self.retired_bands[band])
+        results = []
+        # lines are handed out in placement order so that collisions resolve the same way as a plain list
+        for line_id in sorted(found):
+            line = self.lines[line_id] if line_id in self.lines else self.retired.get(line_id)
+            if line is None:
+                continue
+            if min(line[0][1], line[1][1]) <= y_max and max(line[0][1], line[1][1]) >= y_min:
+                results.append(line)
+        return results
+
+    def near(self, start, end, padding=1):
+        return self.query(min(start[1], end[1]) - padding, max(start[1], end[1]) + padding)
+
+    # everything on screen, retired lines included
+    def visible(self, scroll, height, margin=20):
+        return self.query(scroll - margin, scroll + height + margin, retired=True)
+
+    def evict(self, bands, lines, limit, pinned=()):
+        # takes every line with its top edge under limit out of lines and bands, returns them as (id, line)
+        evicted = []
+        for band in [b for b in bands if (b + 1) * self.band_height > limit]:
+            kept = []
+            for line_id in bands[band]:
+                if line_id not in lines:
+                    continue
+                line = lines[line_id]
+                if (line_id not in pinned) and (min(line[0][1], line[1][1]) > limit):
+                    evicted.append((line_id, lines.pop(line_id)))
+                else:
+                    kept.append(line_id)
+            if kept:
+                bands[band] = kept
+            else:
+                del bands[band]
+        return evicted
+
+    def retire(self, scroll, height):
+        # anything with its top edge this far under the bottom of the screen can't be reached again, so it
+        # leaves the collision bands (the permanent floor stays so the player always has something to land on).
+        # it's still drawn for the first pan_distance of the game over pan, past that it's dropped for good
+        # so the store stays the same size however high the run goes
+        limit = scroll + height + self.retire_distance
+        retired = self.evict(self.bands, self.lines, limit, self.permanent)
+        for line_id, line in retired:
+            self.retired[line_id] = line
+            self.add_to_bands(self.retired_bands, line_id, line)
+        self.evict(self.retired_bands, self.retired, limit + self.pan_distance)
+        if retired:
+            self.version += 1
+        return len(retired)
@@ -0,0 +1,118 @@
+import time, json
+
+# per-section frame timings
+#   with profiler.scope('sparks'):
+#       ...
+# each section keeps its last `size` samples (in ns) in a ring buffer. while the profiler is disabled
+# scope() hands back one shared do-nothing object, so instrumented code costs a method call and nothing else
+
+class NullScope(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+NULL_SCOPE = NullScope()
+
+class Scope(object):
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+        return False
+
+class RingBuffer(object):
+
+    def __init__(self, size):
+        self.samples = [0] * size
+        self.index = 0
+        self.count = 0
+
+    def add(self, value):
+        self.samples[self.index] = value
+        self.index = (self.index + 1) % len(self.samples)
+        self.count = min(self.count + 1, len(self.samples))
+
+    def values(self):
+        if self.count < len(self.samples):
+            return self.samples[:self.count]
+        return self.samples[self.index:] + self.samples[:self.index]
+
+class Profiler(object):
+
+    def __init__(self, size=300, enabled=False):
+        self.size = size
+        self.enabled = enabled
+        self.overlay = False
+        self.sections = {}
+        self.scopes = {}
+
+    def scope(self, name):
+        if not self.enabled:
+            return NULL_SCOPE
+        scope = self.scopes.get(name)
+        if scope is None:
+            scope = Scope(self, name)
+            self.scopes[name] = scope
+        return scope
+
+    def record(self, name, ns):
+        buffer = self.sections.get(name)
+        if buffer is None:
+            buffer = RingBuffer(self.size)
+            self.sections[name] = buffer
+        buffer.add(ns)
+
+    def clear(self):
+        self.sections = {}
+
+    # {section: {'samples', 'avg_ms', 'p99_ms', 'max_ms'}}, in the order sections were first hit
+    def stats(self):
+        stats = {}
+        for name, buffer in self.sections.items():
+            values = sorted(buffer.values())
+            if not values:
+                continue
+            stats[name] = {
+                'samples': len(values),
+                'avg_ms': sum(values) / len(values) / 1000000,
+                'p99_ms': values[min(len(values) - 1, int(len(values) * 0.99))] / 1000000,
+                'max_ms': values[-1] / 1000000,
+            }
+        return stats
+
+    def export_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.stats(), f, indent=2)
+
+    def export_csv(self, path):
+        with open(path, 'w') as f:
+            f.write('section,samples,avg_ms,p99_ms,max_ms\n')
+            for name, s in self.stats().items():
+                f.write('%s,%d,%.4f,%.4f,%.4f\n' % (name, s['samples'], s['avg_ms'], s['p99_ms'], s['max_ms']))
+
+    def export(self, path):
+        if path.endswith('.json'):
+            self.export_json(path)
+        else:
+            self.export_csv(path)
+
+    def draw_overlay(self, surf, font, loc=(4, 20)):
+        y = loc[1]
+        font.render('section  avg  p99 (ms)', surf, (loc[0], y))
+        for name, s in self.stats().items():
+            y += font.line_height + 2
+            font.render('%s %.2f %.2f' % (name, s['avg_ms'], s['p99_ms']), surf, (loc[0], y))
+
+global profiler
+profiler = Profiler()
@@ -0,0 +1,68 @@
+import struct, random
+
+# input recordings for Line Ball
+# a file is a header (magic, version, seed, frame count) followed by one fixed size record per input,
+# which is all a LineBallSim needs to play the same run back
+
+MAGIC = b'LBRP'
+VERSION = 1
+HEADER = struct.Struct('<4sHqI')
+RECORD = struct.Struct('<IBhh')
+
+class ReplayError(Exception):
+    pass
+
+class Recorder(object):
+
+    def __init__(self, path, seed=None):
+        if seed is None:
+            seed = random.randrange(2 ** 32)
+        self.path = path
+        self.seed = seed
+        self.frames = 0
+        self.file = open(path, 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, seed, 0))
+
+    # call with the inputs for each step, right before sim.step(inputs)
+    def record(self, inputs):
+        for event, x, y in inputs:
+            self.file.write(RECORD.pack(self.frames, event, x, y))
+        self.frames += 1
+
+    def close(self):
+        if self.file.closed:
+            return
+        # the frame count goes back into the header so trailing frames with no input get played too
+        self.file.seek(0)
+        self.file.write(HEADER.pack(MAGIC, VERSION, self.seed, self.frames))
+        self.file.close()
+
+class Replay(object):
+
+    def __init__(self, seed, frames, inputs):
+        self.seed = seed
+        self.frames = frames
+        self.inputs = inputs
+
+    def __iter__(self):
+        for frame in range(self.frames):
+            yield self.inputs.get(frame, [])
+
+def load_replay(path):
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        raise ReplayError('%s is too short to be a replay' % path)
+    magic, version, seed, frames = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ReplayError('%s is not a Line Ball replay' % path)
+    if version != VERSION:
+        raise ReplayError('%s is replay version %d, expected %d' % (path, version, VERSION))
+    if (len(data) - HEADER.size) % RECORD.size:
+        raise ReplayError('%s has a truncated record' % path)
+
+    inputs = {}
+    for frame, event, x, y in RECORD.iter_unpack(data[HEADER.size:]):
+        inputs.setdefault(frame, []).append((event, x, y))
+        frames = max(frames, frame + 1)
+    return Replay(seed, frames, inputs)
@@ -1,5 +1,6 @@
 #!/usr/bin/python3.4
 import pygame, sys
+from collections import OrderedDict
 from data.core_funcs import *
 
 def load_font_img(path, font_color):
@@ -12,7 +13,8 @@ def load_font_img(path, font_color):
     letter_spacing = []
     for x in range(font_img.get_width()):
         if font_img.get_at((x, 0))[0] == 127:
-            letters.append(clip(font_img, last_x, 0, x - last_x, font_img.get_height()))
+            # views into the recolored sheet, the letters only ever get blitted from
+            letters.append(clip_view(font_img, last_x, 0, x - last_x, font_img.get_height()))
             letter_spacing.append(x - last_x)
             last_x = x + 1
         x += 1
@@ -21,46 +23,81 @@ def load_font_img(path, font_color):
     return letters, letter_spacing, font_img.get_height()
 
 class Font():
-    def __init__(self, path, color):
+    def __init__(self, path, color, cache_size=64):
         self.letters, self.letter_spacing, self.line_height = load_font_img(path, color)
         self.font_order = ['A','B','C','D','E','F','G','H','I','J','K','L','M','N','O','P','Q','R','S','T','U','V','W','X','Y','Z','a','b','c','d','e','f','g','h','i','j','k','l','m','n','o','p','q','r','s','t','u','v','w','x','y','z','.','-',',',':','+','\'','!','?','0','1','2','3','4','5','6','7','8','9','(',')','/','_','=','\\','[',']','*','"','<','>',';']
+        self.glyphs = {char: i for i, char in enumerate(self.font_order)}
         self.space_width = self.letter_spacing[0]
         self.base_spacing = 1
         self.line_spacing = 2
+        # rendered strings and widths, least recently used ones get dropped first
+        self.cache_size = cache_size
+        self.text_cache = OrderedDict()
+        self.width_cache = OrderedDict()
 
     def width(self, text):
+        if text in self.width_cache:
+            self.width_cache.move_to_end(text)
+            return self.width_cache[text]
         text_width = 0
         for char in text:
             if char == ' ':
                 text_width += self.space_width + self.base_spacing
             else:
-                text_width += self.letter_spacing[self.font_order.index(char)] + self.base_spacing
+                text_width += self.letter_spacing[self.glyphs[char]] + self.base_spacing
+        self.width_cache[text] = text_width
+        if len(self.width_cache) > self.cache_size * 4:
+            self.width_cache.popitem(last=False)
         return text_width
 
-    def render(self, text, surf, loc, line_width=0):
+    def wrap(self, text, line_width):
+        spaces = []
+        x = 0
+        for i, char in enumerate(text):
+            if char == ' ':
+                spaces.append((x, i))
+                x += self.space_width + self.base_spacing
+            else:
+                x += self.letter_spacing[self.glyphs[char]] + self.base_spacing
+        line_offset = 0
+        for i, space in enumerate(spaces):
+            if (space[0] - line_offset) > line_width:
+                line_offset += spaces[i - 1][0] - line_offset
+                if i != 0:
+                    text = text[:spaces[i - 1][1]] + '\n' + text[spaces[i - 1][1] + 1:]
+        return text
+
+    def draw_text(self, text, surf, loc):
         x_offset = 0
         y_offset = 0
-        if line_width != 0:
-            spaces = []
-            x = 0
-            for i, char in enumerate(text):
-                if char == ' ':
-                    spaces.append((x, i))
-                    x += self.space_width + self.base_spacing
-                else:
-                    x += self.letter_spacing[self.font_order.index(char)] + self.base_spacing
-            line_offset = 0
-            for i, space in enumerate(spaces):
-                if (space[0] - line_offset) > line_width:
-                    line_offset += spaces[i - 1][0] - line_offset
-                    if i != 0:
-                        text = text[:spaces[i - 1][1]] + '\n' + text[spaces[i - 1][1] + 1:]
         for char in text:
             if char not in ['\n', ' ']:
-                surf.blit(self.letters[self.font_order.index(char)], (loc[0] + x_offset, loc[1] + y_offset))
-                x_offset += self.letter_spacing[self.font_order.index(char)] + self.base_spacing
+                glyph = self.glyphs[char]
+                surf.blit(self.letters[glyph], (loc[0] + x_offset, loc[1] + y_offset))
+                x_offset += self.letter_spacing[glyph] + self.base_spacing
             elif char == ' ':
                 x_offset += self.space_width + self.base_spacing
             else:
                 y_offset += self.line_spacing + self.line_height
                 x_offset = 0
+
+    def get_surf(self, text, line_width=0):
+        key = (text, line_width)
+        if key in self.text_cache:
+            self.text_cache.move_to_end(key)
+            return self.text_cache[key]
+        if line_width != 0:
+            text = self.wrap(text, line_width)
+        lines = text.split('\n')
+        surf_width = max([self.width(line) for line in lines])
+        surf_height = len(lines) * (self.line_height + self.line_spacing) - self.line_spacing
+        text_surf = pygame.Surface((max(surf_width, 1), surf_height))
+        text_surf.set_colorkey((0, 0, 0))
+        self.draw_text(text, text_surf, (0, 0))
+        self.text_cache[key] = text_surf
+        if len(self.text_cache) > self.cache_size:
+            self.text_cache.popitem(last=False)
+        return text_surf
+
+    def render(self, text, surf, loc, line_width=0):
+        surf.blit(self.get_surf(text, line_width), loc)
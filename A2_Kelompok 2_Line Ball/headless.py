@@ -0,0 +1,78 @@
+import os, time, argparse
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from data.game import *
+from data.autoplay import AutoPlacer
+from data.replay import Recorder
+from data.profiler import profiler
+
+# runs Line Ball without a window and times the simulation and the drawing separately
+#   python headless.py --steps 3600 --seed 1
+#   python headless.py --steps 3600 --no-render
+#   python headless.py --steps 36000 --no-render --record long.lbr
+#   python headless.py --steps 3600 --profile sections.csv   (or .json)
+
+def percentile(samples, p):
+    samples = sorted(samples)
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+def report(name, samples):
+    total = sum(samples)
+    rate = len(samples) / total if total else 0
+    print('%-7s %8.0f /s | p50 %7.1f us | p99 %7.1f us' % (
+        name, rate, percentile(samples, 50) * 1000000, percentile(samples, 99) * 1000000))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--steps', type=int, default=3600)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--no-render', action='store_true')
+    parser.add_argument('--idle', action='store_true', help='no scripted player, the ball just sits on the floor')
+    parser.add_argument('--record', metavar='PATH', help='save the scripted inputs for replay.py')
+    parser.add_argument('--profile', metavar='PATH', help='time each section and write the stats to a .csv or .json file')
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE, 0, 32)
+    load_assets()
+
+    if args.profile:
+        profiler.size = args.steps
+        profiler.enabled = True
+
+    sim = LineBallSim(seed=args.seed)
+    player = None if args.idle else AutoPlacer(seed=args.seed)
+    recorder = Recorder(args.record, args.seed) if args.record else None
+    step_times = []
+    render_times = []
+
+    for i in range(args.steps):
+        inputs = player.inputs(sim) if player else []
+        if recorder:
+            recorder.record(inputs)
+        start = time.perf_counter()
+        sim.step(inputs)
+        step_times.append(time.perf_counter() - start)
+
+        if not args.no_render:
+            start = time.perf_counter()
+            sim.render(screen)
+            render_times.append(time.perf_counter() - start)
+
+    if recorder:
+        recorder.close()
+
+    print('%d steps, seed %d, score %d, best %d, state %s' % (args.steps, args.seed, sim.game_score, sim.high_score, sim.state_hash()))
+    report('step', step_times)
+    if render_times:
+        report('render', render_times)
+    if args.profile:
+        profiler.export(args.profile)
+        print('section timings written to %s' % args.profile)
+
+if __name__ == '__main__':
+    main()
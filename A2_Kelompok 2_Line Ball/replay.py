@@ -0,0 +1,47 @@
+import os, sys, time, argparse
+
+# plays back a recording made with LineBall.py --record (or headless.py --record)
+#   python replay.py run.lbr              as fast as possible, no drawing
+#   python replay.py run.lbr --render     in a window at 60 fps, for looking at it
+# prints the playback speed and the final state hash, which should not change between versions
+
+parser = argparse.ArgumentParser()
+parser.add_argument('path')
+parser.add_argument('--render', action='store_true')
+parser.add_argument('--uncapped', action='store_true', help='with --render, draw as fast as possible')
+args = parser.parse_args()
+
+if not args.render:
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from data.game import *
+from data.replay import load_replay
+
+replay = load_replay(args.path)
+
+pygame.init()
+pygame.display.set_caption('Lynez replay')
+screen = pygame.display.set_mode(SCREEN_SIZE, 0, 32)
+load_assets()
+clock = pygame.time.Clock()
+
+sim = LineBallSim(seed=replay.seed)
+
+start = time.perf_counter()
+for inputs in replay:
+    sim.step(inputs)
+    if args.render:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                sys.exit()
+        sim.render(screen)
+        if not args.uncapped:
+            clock.tick(60)
+elapsed = time.perf_counter() - start
+
+print('%d frames, seed %d, %d inputs' % (replay.frames, replay.seed, sum(len(i) for i in replay.inputs.values())))
+print('%.2fs, %.0f frames/s (%.1fx realtime)' % (elapsed, replay.frames / elapsed, replay.frames / elapsed / 60))
+print('score %d, state %s' % (sim.game_score, sim.state_hash()))
@@ -0,0 +1,98 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from settings import *
+pygame.init()
+pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+from support import SpriteSheet
+from sprites import Sprite, Player
+from spatial import TileIndex
+
+# players running and jumping around a level, moved once with the old loops over every
+# collision sprite and once with the TileIndex. both have to end every frame in the same place
+# with the same speed and on_floor, then the move + floor check time is compared
+
+PLAYERS = 40
+FRAMES = 600
+DT = 1 / FRAMERATE
+
+class OldPlayer(Player):
+    def collision(self, direction):
+        for sprite in self.collision_sprites:
+            if sprite.rect.colliderect(self.rect):
+                if direction == 'horizontal':
+                    if self.direction.x > 0:
+                        self.rect.right = sprite.rect.left
+                    if self.direction.x < 0:
+                        self.rect.left = sprite.rect.right
+                if direction == 'vertical':
+                    if self.direction.y > 0:
+                        self.rect.bottom = sprite.rect.top
+                        self.on_floor = True
+                    if self.direction.y < 0:
+                        self.rect.top = sprite.rect.bottom
+                    self.direction.y = 0
+
+    def check_floor(self):
+        bottom_rect = pygame.Rect(0, 0, self.rect.width, 2)
+        bottom_rect.midtop = self.rect.midbottom
+        self.on_floor = bottom_rect.collidelist([sprite.rect for sprite in self.collision_sprites]) >= 0
+
+def world_tiles():
+    tmx_map = load_pygame(join('..', 'data', 'maps', 'world.tmx'))
+    return tmx_map.width, tmx_map.height, [(x, y) for x, y, _ in tmx_map.get_layer_by_name('Main').tiles()]
+
+def synthetic_tiles(width, height, rng):
+    taken = set()
+    for i in range(width * height // 60):
+        x, y = rng.randrange(width), rng.randrange(height)
+        for dx in range(rng.randint(3, 10)):
+            taken.add((min(width - 1, x + dx), y))
+    # a floor so nobody falls forever
+    taken.update((x, height - 1) for x in range(width))
+    return width, height, sorted(taken, key = lambda tile: (tile[1], tile[0]))
+
+def run(name, width, height, tiles, rng):
+    tile_surf = pygame.Surface((TILE_SIZE, TILE_SIZE))
+    collision_sprites = pygame.sprite.Group()
+    for x, y in tiles:
+        Sprite((x * TILE_SIZE, y * TILE_SIZE), tile_surf, collision_sprites)
+    tile_index = TileIndex(collision_sprites)
+    frames = SpriteSheet([pygame.Surface((40, 56))])
+
+    pairs = []
+    for i in range(PLAYERS):
+        pos = (rng.randrange(width * TILE_SIZE), rng.randrange(height * TILE_SIZE))
+        pairs.append((OldPlayer(pos, None, collision_sprites, frames, None, tile_index),
+                      Player(pos, None, collision_sprites, frames, None, tile_index)))
+
+    old_time = new_time = 0
+    for frame in range(FRAMES):
+        for old, new in pairs:
+            # same made up input for both
+            if frame % 20 == 0:
+                old.direction.x = new.direction.x = rng.choice([-1, 0, 1])
+            jump = rng.random() < 0.05
+
+            start = time.perf_counter()
+            old.check_floor()
+            if jump and old.on_floor:
+                old.direction.y = -550
+            old.move(DT)
+            old_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            new.check_floor()
+            if jump and new.on_floor:
+                new.direction.y = -550
+            new.move(DT)
+            new_time += time.perf_counter() - start
+
+            assert (old.rect, old.direction, old.on_floor) == (new.rect, new.direction, new.on_floor), (name, frame)
+
+    moves = FRAMES * PLAYERS
+    print('%-10s %6d tiles | all sprites %8.1f us/move | TileIndex %5.1f us/move | %6.1fx | %d moves, same results' % (
+        name, len(tiles), old_time / moves * 1000000, new_time / moves * 1000000, old_time / new_time, moves))
+
+rng = random.Random(0)
+run('world.tmx', *world_tiles(), rng)
+run('200x200', *synthetic_tiles(200, 200, rng), rng)
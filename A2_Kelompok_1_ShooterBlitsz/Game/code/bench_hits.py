@@ -0,0 +1,74 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from settings import *
+pygame.init()
+pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+from support import import_image, import_sheet
+from sprites import Sprite, Bullet, Bee
+from spatial import SpatialHash
+
+# 200 bees swarming around the player while it fires three bullets a frame both ways.
+# every frame the bullet -> enemy and enemy -> player hits are found with spritecollide over the
+# whole enemy group and with the SpatialHash, the hit lists have to match, then both are timed
+
+BEES = 200
+FRAMES = 600
+SHOTS = 3
+DT = 1 / FRAMERATE
+
+rng = random.Random(0)
+bee_sheet = import_sheet('..', 'images', 'enemies', 'bee')
+bullet_surf = import_image('..', 'images', 'gun', 'bullet')
+player = Sprite((2000, 1000), import_sheet('..', 'images', 'player')[0], None)
+camera = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+camera.center = player.rect.center
+bees = pygame.sprite.Group()
+bullets = pygame.sprite.Group()
+enemy_hash = SpatialHash()
+
+def spawn_bee():
+    # within a couple of screens of the player, mostly around the height it shoots at
+    pos = (player.rect.centerx + rng.randint(-WINDOW_WIDTH, WINDOW_WIDTH * 2), player.rect.centery + rng.randint(-150, 100))
+    Bee(bee_sheet, pos, bees, rng.randint(250, 350))
+
+for i in range(BEES):
+    spawn_bee()
+
+old_time = new_time = 0
+old_tests = 0
+totals = {'pairs': 0, 'rect_passes': 0, 'mask_tests': 0, 'hits': 0}
+for frame in range(FRAMES):
+    for i in range(SHOTS):
+        direction = rng.choice([-1, 1])
+        Bullet(bullet_surf, (player.rect.centerx, player.rect.top + rng.randint(0, 48)), direction, bullets, camera)
+    bees.update(DT)
+    bullets.update(DT)
+    while len(bees) < BEES:
+        spawn_bee()
+
+    start = time.perf_counter()
+    old_hits = [pygame.sprite.spritecollide(bullet, bees, False, pygame.sprite.collide_mask) for bullet in bullets]
+    old_hits.append(pygame.sprite.spritecollide(player, bees, False, pygame.sprite.collide_mask))
+    old_time += time.perf_counter() - start
+    old_tests += (len(bullets) + 1) * len(bees)
+
+    start = time.perf_counter()
+    enemy_hash.build(bees)
+    new_hits = [enemy_hash.collide(bullet) for bullet in bullets]
+    new_hits.append(enemy_hash.collide(player))
+    new_time += time.perf_counter() - start
+    assert new_hits == old_hits, frame
+    for key in totals:
+        totals[key] += getattr(enemy_hash, key)
+
+    # what Game.collision does with them: bullets that hit go, bees that got hit die
+    for bullet, hits in zip(list(bullets), new_hits):
+        if hits:
+            bullet.kill()
+    for hits in new_hits:
+        for bee in hits:
+            bee.kill()
+
+print('%d bees, %d frames, %d bullets alive at the end | spritecollide %.2f ms/frame (%.0f mask tests/frame) | SpatialHash %.2f ms/frame | %.1fx | same hits' % (
+    BEES, FRAMES, len(bullets), old_time / FRAMES * 1000, old_tests / FRAMES, new_time / FRAMES * 1000, old_time / new_time))
+print('per frame: %.1f broadphase pairs, %.1f rect passes, %.1f mask tests, %.1f hits' % tuple(totals[key] / FRAMES for key in ('pairs', 'rect_passes', 'mask_tests', 'hits')))
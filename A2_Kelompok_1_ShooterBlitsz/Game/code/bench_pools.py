@@ -0,0 +1,100 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from settings import *
+pygame.init()
+pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+from support import import_image, import_sheet, SpriteSheet
+from sprites import Sprite, Bullet, Fire
+from timer import Timer, scheduler
+from pool import SpritePool
+
+# a player running back and forth firing every few frames, once the way create_bullet used to do it
+# (new Bullet + Fire per shot, a mask each, a flip for every leftward shot, bullets alive until
+# 2000px past the screen edge in world coordinates) and once through the pools with camera despawn
+
+FRAMES = 3000
+FIRE_EVERY = 3
+DT = 1 / FRAMERATE
+
+class OldBullet(Sprite):
+    def __init__(self, surf, pos, direction, groups):
+        super().__init__(pos, surf, groups)
+        if direction == -1:
+            self.image = pygame.transform.flip(self.image, True, False)
+        self.direction = direction
+        self.speed = 850
+
+    def update(self, dt):
+        self.rect.x += int(self.direction * self.speed * dt)
+        if self.rect.right < -2000 or self.rect.left > WINDOW_WIDTH + 2000:
+            self.kill()
+
+class OldFire(Sprite):
+    def __init__(self, surf, pos, groups, player):
+        super().__init__(pos, surf, groups)
+        self.player = player
+        self.flip = player.flip
+        self.timer = Timer(100, autostart=True, func=self.kill)
+        self.y_offset = pygame.Vector2(0, 8)
+        if self.player.flip:
+            self.rect.midright = self.player.rect.midleft + self.y_offset
+            self.image = pygame.transform.flip(self.image, True, False)
+        else:
+            self.rect.midleft = self.player.rect.midright + self.y_offset
+
+    update = Fire.update
+
+def run(shoot):
+    rng = random.Random(0)
+    player = Sprite((1400, 400), import_sheet('..', 'images', 'player')[0], None)
+    player.flip = False
+    camera = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+    group = pygame.sprite.Group()
+    shoot_time = update_time = 0
+    alive = 0
+    for frame in range(FRAMES):
+        # turns around now and then, and at the ends of a world.tmx sized level
+        if rng.random() < 0.02:
+            player.flip = not player.flip
+        if player.rect.left <= 0 or player.rect.right >= 45 * TILE_SIZE:
+            player.flip = player.rect.left > 0
+        player.rect.x += int((-400 if player.flip else 400) * DT)
+        camera.center = player.rect.center
+        start = time.perf_counter()
+        if frame % FIRE_EVERY == 0:
+            shoot(player, group, camera)
+        shoot_time += time.perf_counter() - start
+        start = time.perf_counter()
+        scheduler.update()
+        group.update(DT)
+        update_time += time.perf_counter() - start
+        alive = max(alive, len(group))
+        # the muzzle flash lives 100 ms of real time, keep the frames roughly real time
+        time.sleep(max(0, DT / 8))
+    return shoot_time, update_time, alive
+
+bullet_surf = import_image('..', 'images', 'gun', 'bullet')
+fire_surf = import_image('..', 'images', 'gun', 'fire')
+
+def old_shoot(player, group, camera):
+    direction = -1 if player.flip else 1
+    OldBullet(bullet_surf, player.rect.center, direction, group)
+    OldFire(fire_surf, player.rect.center, group, player)
+
+bullet_sheet, fire_sheet = SpriteSheet([bullet_surf]), SpriteSheet([fire_surf])
+bullet_pool = SpritePool(lambda *args: Bullet(bullet_sheet, *args))
+fire_pool = SpritePool(lambda *args: Fire(fire_sheet, *args))
+
+def pooled_shoot(player, group, camera):
+    direction = -1 if player.flip else 1
+    bullet_pool.get(player.rect.center, direction, group, camera)
+    fire_pool.get(player.rect.center, group, player)
+
+shots = (FRAMES + FIRE_EVERY - 1) // FIRE_EVERY
+for name, shoot in [('new sprites', old_shoot), ('pools', pooled_shoot)]:
+    shoot_time, update_time, alive = run(shoot)
+    print('%-11s %d shots | %5.1f us/shot | update %.3f ms/frame | up to %4d sprites alive' % (
+        name, shots, shoot_time / shots * 1000000, update_time / FRAMES * 1000, alive))
+for name, pool in [('bullet pool', bullet_pool), ('fire pool', fire_pool)]:
+    print('%-11s %d requests, %d reused, %d allocated | hit rate %.1f%%' % (
+        name, pool.requests, pool.hits, pool.allocations, pool.hit_rate() * 100))
@@ -0,0 +1,70 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from settings import *
+pygame.init()
+pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+from support import import_folder, SpriteSheet
+from sprites import Bee, Crab
+
+# 300 bees (and a few crabs walking back and forth) updated with the old animate, which made
+# a new mask every frame and rebuilt the crab frames on every turn, and with the SpriteSheet
+# references. both run in lockstep, the images and masks have to match every frame
+
+BEES = 300
+CRABS = 20
+FRAMES = 300
+DT = 1 / FRAMERATE
+
+class OldBee(Bee):
+    def animate(self, dt):
+        self.frame_index += self.animation_speed * dt
+        self.image = self.frames[int(self.frame_index) % len(self.frames)]
+        self.mask = pygame.mask.from_surface(self.image)
+
+class OldCrab(Crab):
+    animate = OldBee.animate
+
+    def constraint(self):
+        if not self.main_rect.contains(self.rect):
+            self.direction *= -1
+            self.frames = [pygame.transform.flip(surf, True, False) for surf in self.frames]
+
+def spawn(bee_class, crab_class, bee_frames, crab_frames, seed):
+    rng = random.Random(seed)
+    group = pygame.sprite.Group()
+    for i in range(BEES):
+        bee_class(bee_frames, (rng.randint(2000, 20000), rng.randint(0, 1500)), group, rng.randint(250, 350))
+    for i in range(CRABS):
+        crab = crab_class(crab_frames, pygame.Rect(rng.randint(0, 3000), rng.randint(0, 1500), rng.randint(256, 576), height), group)
+        crab.speed = 120
+    return group
+
+def same_mask(a, b):
+    return a.get_size() == b.get_size() and a.count() == b.count() == a.overlap_area(b, (0, 0))
+
+bee_frames = import_folder('..', 'images', 'enemies', 'bee')
+# scaled to the player's height like Game.load_assets does
+height = import_folder('..', 'images', 'player')[0].get_height()
+crab_frames = [pygame.transform.scale(surf, (int(surf.get_width() * height / surf.get_height()), height))
+               for surf in import_folder('..', 'images', 'enemies', 'worm')]
+
+start = time.perf_counter()
+bee_sheet, crab_sheet = SpriteSheet(bee_frames), SpriteSheet(crab_frames)
+sheet_time = time.perf_counter() - start
+
+old = spawn(OldBee, OldCrab, list(bee_frames), list(crab_frames), 0)
+new = spawn(Bee, Crab, bee_sheet, crab_sheet, 0)
+old_time = new_time = 0
+for frame in range(FRAMES):
+    start = time.perf_counter()
+    old.update(DT)
+    old_time += time.perf_counter() - start
+    start = time.perf_counter()
+    new.update(DT)
+    new_time += time.perf_counter() - start
+    for a, b in zip(old.sprites(), new.sprites()):
+        assert pygame.image.tostring(a.image, 'RGBA') == pygame.image.tostring(b.image, 'RGBA')
+        assert same_mask(a.mask, b.mask)
+
+print('%d bees + %d crabs, %d frames | update old %.2f ms/frame, sheet %.2f ms/frame | %.1fx | sheets built in %.1f ms | same images and masks' % (
+    BEES, CRABS, FRAMES, old_time / FRAMES * 1000, new_time / FRAMES * 1000, old_time / new_time, sheet_time * 1000))
@@ -0,0 +1,104 @@
+import os, time, random
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+from settings import *
+pygame.init()
+pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
+from groups import AllSprites, TileChunks
+from sprites import Sprite
+
+# draws the same level two ways while the camera sweeps across it: every tile as its own sprite
+# (what AllSprites.draw used to do) and the baked chunks plus culled sprites.
+# checks both frames are the same pixels, then compares blits per frame and draw time
+# on world.tmx and on a made up 500x500 map with the same tiles
+
+FRAMES = 200
+ENEMIES = 100
+
+# resident memory in MB, linux only
+def rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1048576
+    except (OSError, ValueError, AttributeError):
+        return float('nan')
+
+def world_tiles():
+    tmx_map = load_pygame(join('..', 'data', 'maps', 'world.tmx'))
+    layers = [list(tmx_map.get_layer_by_name(name).tiles()) for name in ('Main', 'Decoration')]
+    return tmx_map.width, tmx_map.height, layers
+
+# platform runs like the ones in world.tmx, about the same tile density
+def synthetic_tiles(width, height, tile_layers, rng):
+    main_images = [image for _, _, image in tile_layers[0]]
+    decoration_images = [image for _, _, image in tile_layers[1]]
+    main, decoration, taken = [], [], set()
+    for i in range(width * height // 60):
+        x, y = rng.randrange(width), rng.randrange(1, height)
+        for dx in range(rng.randint(3, 10)):
+            if x + dx < width and (x + dx, y) not in taken:
+                taken.add((x + dx, y))
+                main.append((x + dx, y, rng.choice(main_images)))
+                if rng.random() < 0.35:
+                    decoration.append((x + dx, y - 1, rng.choice(decoration_images)))
+    return width, height, [main, decoration]
+
+def camera_path(width, height):
+    # diagonal sweep across the whole level
+    for i in range(FRAMES):
+        yield (int(WINDOW_WIDTH / 2 + (width * TILE_SIZE - WINDOW_WIDTH) * i / FRAMES),
+               int(WINDOW_HEIGHT / 2 + (height * TILE_SIZE - WINDOW_HEIGHT) * i / FRAMES))
+
+def run(name, width, height, layers, rng):
+    display = pygame.display.get_surface()
+    enemy_surf = pygame.Surface((48, 48), pygame.SRCALPHA)
+    enemy_surf.fill((200, 40, 40, 255))
+    enemies = [((rng.randrange(width * TILE_SIZE), rng.randrange(height * TILE_SIZE)), enemy_surf) for i in range(ENEMIES)]
+
+    old = AllSprites()
+    for layer in layers:
+        for x, y, image in layer:
+            Sprite((x * TILE_SIZE, y * TILE_SIZE), image, old)
+    memory = rss()
+    start = time.perf_counter()
+    new = AllSprites()
+    new.tiles = TileChunks()
+    for layer in layers:
+        for x, y, image in layer:
+            new.tiles.add(x, y, image)
+    new.tiles.build()
+    build_time = time.perf_counter() - start
+    chunk_bytes = sum(chunk.get_width() * chunk.get_height() * 4 for chunk, _ in new.tiles.chunks.values())
+    memory = rss() - memory
+    for pos, surf in enemies:
+        Sprite(pos, surf, old)
+        Sprite(pos, surf, new)
+
+    old_blits = len(old)
+    old_time = new_time = 0
+    new_blits = []
+    for target in camera_path(width, height):
+        display.fill(BG_COLOR)
+        start = time.perf_counter()
+        # the draw before chunking, everything every frame
+        offset = pygame.Vector2(-(target[0] - WINDOW_WIDTH / 2), -(target[1] - WINDOW_HEIGHT / 2))
+        for sprite in old:
+            display.blit(sprite.image, sprite.rect.topleft + offset)
+        old_time += time.perf_counter() - start
+        expected = pygame.image.tostring(display, 'RGB')
+
+        display.fill(BG_COLOR)
+        start = time.perf_counter()
+        new.draw(target)
+        new_time += time.perf_counter() - start
+        new_blits.append(new.blits)
+        assert pygame.image.tostring(display, 'RGB') == expected, target
+
+    print('%-10s %6d tiles, %4d chunks (%6.1f MB unencoded, %5.1f MB resident, built in %4.0f ms) | blits/frame: all %6d, culled avg %5.1f max %3d | draw %7.2f ms -> %5.2f ms | %5.1fx | same pixels' % (
+        name, sum(len(layer) for layer in layers), len(new.tiles.chunks), chunk_bytes / 1048576, memory, build_time * 1000,
+        old_blits, sum(new_blits) / len(new_blits), max(new_blits),
+        old_time / FRAMES * 1000, new_time / FRAMES * 1000, old_time / new_time))
+
+rng = random.Random(0)
+width, height, layers = world_tiles()
+run('world.tmx', width, height, layers, rng)
+run('500x500', *synthetic_tiles(500, 500, layers, rng), rng)
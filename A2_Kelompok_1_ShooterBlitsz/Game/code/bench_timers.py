@@ -0,0 +1,83 @@
+import time, random
+from settings import *
+from timer import Timer, scheduler
+
+# a crowd of timers like a busy game has: a death timer per enemy (mostly idle), muzzle flash
+# timers started on every shot, the shot cooldown and the repeating bee spawner. once with the old
+# Timer polled every frame and once with the scheduler, on a fake clock so both see the same ticks.
+# every callback has to come in the same frame. within a frame the scheduler goes by deadline
+# where polling went by list order, so the logs are compared sorted
+
+ENEMIES = 500
+FRAMES = 3000
+FRAME_MS = 16
+
+clock = [1]
+pygame.time.get_ticks = lambda: clock[0]
+
+# the Timer as it was, checking the clock itself on every update
+class PolledTimer:
+    def __init__(self, duration, func = None, repeat = None, autostart = False):
+        self.duration = duration
+        self.start_time = 0
+        self.active = False
+        self.func = func
+        self.repeat = repeat
+        if autostart:
+            self.activate()
+
+    def __bool__(self):
+        return self.active
+
+    def activate(self):
+        self.active = True
+        self.start_time = pygame.time.get_ticks()
+
+    def deactivate(self):
+        self.active = False
+        self.start_time = 0
+        if self.repeat:
+            self.activate()
+
+    def update(self):
+        if pygame.time.get_ticks() - self.start_time >= self.duration:
+            if self.func and self.start_time != 0:
+                self.func()
+            self.deactivate()
+
+def run(timer_class, tick):
+    rng = random.Random(0)
+    clock[0] = 1
+    scheduler.clear()
+    log = []
+    timers = []
+    def make(duration, name, **kwargs):
+        timers.append(timer_class(duration, func = lambda: log.append((clock[0], name)), **kwargs))
+        return timers[-1]
+
+    deaths = [make(200, 'death %d' % i) for i in range(ENEMIES)]
+    flashes = [make(100, 'flash %d' % i) for i in range(20)]
+    cooldown = make(500, 'cooldown')
+    make(900, 'spawn', repeat = True, autostart = True)
+
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        clock[0] += FRAME_MS
+        tick(timers)
+        # shooting whenever the cooldown allows, every shot kills an enemy now and then
+        if not cooldown:
+            cooldown.activate()
+            flashes[frame % len(flashes)].activate()
+        if rng.random() < 0.05:
+            deaths[rng.randrange(ENEMIES)].activate()
+    return time.perf_counter() - start, log
+
+def poll(timers):
+    for t in timers:
+        t.update()
+
+old_time, old_log = run(PolledTimer, poll)
+new_time, new_log = run(Timer, lambda timers: scheduler.update())
+assert sorted(new_log) == sorted(old_log)
+print('%d timers, %d frames, %d callbacks | polling %.1f us/frame | scheduler %.1f us/frame | %.0fx | same callbacks in the same frames' % (
+    ENEMIES + 22, FRAMES, len(new_log), old_time / FRAMES * 1000000, new_time / FRAMES * 1000000, old_time / new_time))
@@ -1,14 +1,74 @@
-from settings import * 
+from settings import *
+
+# static tile layers baked into CHUNK_TILES x CHUNK_TILES surfaces when the level loads
+# each chunk is cropped to the tiles it actually has, so empty sky costs no memory
+class TileChunks:
+    def __init__(self, chunk_tiles = CHUNK_TILES):
+        self.chunk_tiles = chunk_tiles
+        self.chunk_size = chunk_tiles * TILE_SIZE
+        self.pending = {}
+        self.chunks = {}
+
+    # tiles are drawn in the order they are added, so add the layers bottom to top
+    def add(self, x, y, surf):
+        key = (x // self.chunk_tiles, y // self.chunk_tiles)
+        self.pending.setdefault(key, []).append(((x * TILE_SIZE, y * TILE_SIZE), surf))
+
+    def build(self):
+        scratch = pygame.Surface((1, 1))
+        for key, tiles in self.pending.items():
+            bounds = pygame.Rect(tiles[0][0], tiles[0][1].get_size()).unionall(
+                [pygame.Rect(pos, surf.get_size()) for pos, surf in tiles[1:]])
+            chunk = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            for pos, surf in tiles:
+                chunk.blit(surf, (pos[0] - bounds.x, pos[1] - bounds.y))
+            # RLE skips the transparent runs when blitting, and once encoded SDL drops the raw pixels.
+            # one blit onto the scratch surface does the encoding now instead of on the first frame
+            chunk.set_alpha(255, pygame.RLEACCEL)
+            scratch.blit(chunk, (0, 0))
+            self.chunks[key] = (chunk, bounds)
+        self.pending = {}
+
+    def visible(self, camera):
+        # tiles never stick out of their chunk by more than one chunk
+        left, top = camera.left // self.chunk_size - 1, camera.top // self.chunk_size - 1
+        right, bottom = camera.right // self.chunk_size, camera.bottom // self.chunk_size
+        for cy in range(top, bottom + 1):
+            for cx in range(left, right + 1):
+                chunk = self.chunks.get((cx, cy))
+                if chunk and chunk[1].colliderect(camera):
+                    yield chunk
 
 class AllSprites(pygame.sprite.Group):
     def __init__(self):
         super().__init__()
         self.display_surface = pygame.display.get_surface()
         self.offset = pygame.Vector2()
+        self.tiles = None
+        # a pixel of slack on each side, the blit position gets truncated
+        self.camera = pygame.Rect(0, 0, WINDOW_WIDTH + 2, WINDOW_HEIGHT + 2)
+        self.blits = 0      # blits in the last draw, tiles + sprites
+        self.culled = 0     # sprites skipped in the last draw
 
-    def draw(self, target_pos):
+    # centers the camera on target_pos, camera is the visible part of the world
+    def follow(self, target_pos):
         self.offset.x = -(target_pos[0] - WINDOW_WIDTH / 2)
         self.offset.y = -(target_pos[1] - WINDOW_HEIGHT / 2)
+        self.camera.topleft = (-int(self.offset.x) - 1, -int(self.offset.y) - 1)
+
+    def draw(self, target_pos):
+        self.follow(target_pos)
+        self.blits = 0
+        self.culled = 0
+
+        if self.tiles:
+            for chunk, bounds in self.tiles.visible(self.camera):
+                self.display_surface.blit(chunk, bounds.topleft + self.offset)
+                self.blits += 1
 
         for sprite in self:
-            self.display_surface.blit(sprite.image, sprite.rect.topleft + self.offset)
\ No newline at end of file
+            if sprite.rect.colliderect(self.camera):
+                self.display_surface.blit(sprite.image, sprite.rect.topleft + self.offset)
+                self.blits += 1
+            else:
+                self.culled += 1
\ No newline at end of file
@@ -1,8 +1,10 @@
 from settings import *
 from sprites import *
-from groups import AllSprites
+from groups import AllSprites, TileChunks
+from spatial import TileIndex, SpatialHash
+from pool import SpritePool
 from support import *
-from timer import Timer
+from timer import Timer, scheduler
 from random import randint
 import os
 import pygame
@@ -21,6 +23,8 @@ class Game:
         pygame.display.set_caption('ShooterBlitsz')
         self.clock = pygame.time.Clock()
         self.running = True
+        # timers left over from the last round (restart calls __init__ again) must not fire
+        scheduler.clear()
 
         self.health = 2
         self.kills = 0
@@ -32,6 +36,7 @@ class Game:
         self.collision_sprites = pygame.sprite.Group()
         self.bullet_sprites = pygame.sprite.Group()
         self.enemy_sprites = pygame.sprite.Group()
+        self.enemy_hash = SpatialHash()
 
         # load assets
         self.load_assets()
@@ -49,6 +54,10 @@ class Game:
             except Exception:
                 pass
 
+        # bullets and muzzle flashes get recycled instead of made for every shot
+        self.bullet_pool = SpritePool(lambda *args: Bullet(self.bullet_sheet, *args))
+        self.fire_pool = SpritePool(lambda *args: Fire(self.fire_sheet, *args))
+
         # setup level dan spawn musuh
         self.setup()
         self.bee_timer = Timer(900, func=self.create_bee, autostart=True, repeat=True)
@@ -93,8 +102,8 @@ class Game:
     # tembak peluru
     def create_bullet(self, pos, direction):
         x = pos[0] + direction * 34 if direction == 1 else pos[0] + direction * 34 - self.bullet_surf.get_width()
-        Bullet(self.bullet_surf, (x, pos[1]), direction, (self.all_sprites, self.bullet_sprites))
-        Fire(self.fire_surf, pos, self.all_sprites, self.player)
+        self.bullet_pool.get((x, pos[1]), direction, (self.all_sprites, self.bullet_sprites), self.all_sprites.camera)
+        self.fire_pool.get(pos, self.all_sprites, self.player)
         if 'shoot' in self.audio:
             try:
                 self.audio['shoot'].play()
@@ -143,14 +152,23 @@ class Game:
             if not self.worm_frames:
                 self.worm_frames = [pygame.Surface((32,32)).convert_alpha()]
 
+            # flipped frames and masks made once here instead of every frame
+            self.bullet_sheet = SpriteSheet([self.bullet_surf])
+            self.fire_sheet = SpriteSheet([self.fire_surf])
+            self.player_frames = SpriteSheet(self.player_frames)
+            self.bee_frames = SpriteSheet(self.bee_frames)
+            self.worm_frames = SpriteSheet(self.worm_frames)
+
         except:
             dummy = pygame.Surface((32,32)).convert_alpha()
             dummy.fill((255,0,255))
-            self.player_frames = [dummy]
-            self.bee_frames = [dummy]
-            self.worm_frames = [dummy]
+            self.player_frames = SpriteSheet([dummy])
+            self.bee_frames = SpriteSheet([dummy])
+            self.worm_frames = SpriteSheet([dummy])
             self.bullet_surf = dummy
             self.fire_surf = dummy
+            self.bullet_sheet = SpriteSheet([dummy])
+            self.fire_sheet = SpriteSheet([dummy])
             self.audio = {}
 
     # setup level
@@ -163,11 +181,17 @@ class Game:
             self.level_width = tmx_map.width * TILE_SIZE
             self.level_height = tmx_map.height * TILE_SIZE
 
+            # tiles get baked into chunks, the Main sprites only stay around for collisions
+            tiles = TileChunks()
             for x, y, image in tmx_map.get_layer_by_name('Main').tiles():
-                Sprite((x * TILE_SIZE, y * TILE_SIZE), image, (self.all_sprites, self.collision_sprites))
+                Sprite((x * TILE_SIZE, y * TILE_SIZE), image, self.collision_sprites)
+                tiles.add(x, y, image)
 
             for x, y, image in tmx_map.get_layer_by_name('Decoration').tiles():
-                Sprite((x * TILE_SIZE, y * TILE_SIZE), image, self.all_sprites)
+                tiles.add(x, y, image)
+            tiles.build()
+            self.all_sprites.tiles = tiles
+            self.tile_index = TileIndex(self.collision_sprites)
 
             for obj in tmx_map.get_layer_by_name('Entities'):
                 if obj.name == 'Player':
@@ -176,8 +200,11 @@ class Game:
                         self.all_sprites,
                         self.collision_sprites,
                         self.player_frames,
-                        self.create_bullet
+                        self.create_bullet,
+                        self.tile_index
                     )
+                    # camera starts on the player, bullets fired before the first draw despawn against it
+                    self.all_sprites.follow(self.player.rect.center)
                 if obj.name == 'Worm':
                     Worm(
                         self.worm_frames,
@@ -189,9 +216,12 @@ class Game:
 
     # collision handling
     def collision(self):
+        # enemies go into the hash once a frame, bullets and the player only test the ones near them
+        self.enemy_hash.build(self.enemy_sprites)
+
         # peluru → musuh
         for bullet in list(self.bullet_sprites):
-            hits = pygame.sprite.spritecollide(bullet, self.enemy_sprites, False, pygame.sprite.collide_mask)
+            hits = self.enemy_hash.collide(bullet)
             if hits:
                 if 'impact' in self.audio:
                     try:
@@ -214,7 +244,7 @@ class Game:
                         return
 
         # musuh → player
-        collisions = pygame.sprite.spritecollide(self.player, self.enemy_sprites, False, pygame.sprite.collide_mask)
+        collisions = self.enemy_hash.collide(self.player)
         if collisions:
             for enemy in collisions:
                 try:
@@ -314,7 +344,8 @@ class Game:
                 if event.type == pygame.QUIT:
                     self.running = False
 
-            self.bee_timer.update()
+            # fires every timer that's due, the bee spawner, death timers, muzzle flashes, shot cooldown
+            scheduler.update()
             self.all_sprites.update(dt)
             self.collision()
 
@@ -0,0 +1,28 @@
+# recycles sprites that come and go all the time (bullets, muzzle flashes).
+# get() hands back a released sprite reset with the same arguments its constructor takes,
+# or makes a new one. Sprite.kill puts pooled sprites back with release()
+class SpritePool:
+    def __init__(self, create):
+        self.create = create
+        self.free = []
+        self.requests = 0
+        self.hits = 0
+        self.allocations = 0
+
+    def get(self, *args):
+        self.requests += 1
+        if self.free:
+            self.hits += 1
+            sprite = self.free.pop()
+            sprite.reset(*args)
+        else:
+            self.allocations += 1
+            sprite = self.create(*args)
+            sprite.pool = self
+        return sprite
+
+    def release(self, sprite):
+        self.free.append(sprite)
+
+    def hit_rate(self):
+        return self.hits / self.requests if self.requests else 0
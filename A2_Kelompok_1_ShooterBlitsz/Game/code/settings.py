@@ -5,5 +5,6 @@ from pytmx.util_pygame import load_pygame
 
 WINDOW_WIDTH, WINDOW_HEIGHT = 1280,720
 TILE_SIZE = 64 
+CHUNK_TILES = 8
 FRAMERATE = 60
 BG_COLOR = '#fcdfcd'
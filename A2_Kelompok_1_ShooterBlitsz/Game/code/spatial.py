@@ -0,0 +1,76 @@
+from settings import *
+
+# every (x, y) grid cell a rect touches
+def grid_cells(rect, cell_size):
+    for y in range(rect.top // cell_size, (rect.bottom - 1) // cell_size + 1):
+        for x in range(rect.left // cell_size, (rect.right - 1) // cell_size + 1):
+            yield x, y
+
+# grid over the static level tiles, keyed by tile coordinates. built once when the level loads,
+# queries only look at the few cells around a rect instead of every tile.
+# tiles keep their index in the group they came from, so results come back in that order
+class TileIndex:
+    def __init__(self, sprites, cell_size = TILE_SIZE):
+        self.cell_size = cell_size
+        self.rects = [sprite.rect for sprite in sprites]
+        self.cells = {}
+        for index, rect in enumerate(self.rects):
+            for cell in grid_cells(rect, cell_size):
+                self.cells.setdefault(cell, []).append(index)
+
+    # the first tile after `after` (in group order) that overlaps rect, or None
+    def first_hit(self, rect, after = -1):
+        first = None
+        for cell in grid_cells(rect, self.cell_size):
+            for index in self.cells.get(cell, ()):
+                if index > after and (first is None or index < first) and self.rects[index].colliderect(rect):
+                    first = index
+        return first
+
+    def collides(self, rect):
+        for cell in grid_cells(rect, self.cell_size):
+            for index in self.cells.get(cell, ()):
+                if self.rects[index].colliderect(rect):
+                    return True
+        return False
+
+# hash over sprites that move, rebuilt from the group every frame. collide() only rect tests
+# the sprites sharing a cell with the one asked about, and only mask tests the rect hits.
+# sprite rects are the size of their masks, so skipping the mask test on a rect miss changes nothing
+class SpatialHash:
+    def __init__(self, cell_size = 128):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.order = {}
+        # counts for the last build
+        self.pairs = 0          # broadphase candidates, sprites sharing a cell
+        self.rect_passes = 0    # candidates whose rects overlap
+        self.mask_tests = 0
+        self.hits = 0
+
+    def build(self, sprites):
+        self.cells = {}
+        self.order = {}
+        self.pairs = self.rect_passes = self.mask_tests = self.hits = 0
+        for index, sprite in enumerate(sprites):
+            self.order[sprite] = index
+            for cell in grid_cells(sprite.rect, self.cell_size):
+                self.cells.setdefault(cell, []).append(sprite)
+
+    # same result as pygame.sprite.spritecollide(sprite, group, False, collide_mask) on the group
+    # the hash was built from, in the group's order. sprites killed since the build are left out
+    def collide(self, sprite):
+        found = set()
+        for cell in grid_cells(sprite.rect, self.cell_size):
+            found.update(self.cells.get(cell, ()))
+        self.pairs += len(found)
+        hits = []
+        for other in sorted(found, key = self.order.__getitem__):
+            if not other.alive() or not sprite.rect.colliderect(other.rect):
+                continue
+            self.rect_passes += 1
+            self.mask_tests += 1
+            if pygame.sprite.collide_mask(sprite, other):
+                hits.append(other)
+        self.hits += len(hits)
+        return hits
@@ -1,4 +1,6 @@
 from settings import * 
+from support import SpriteSheet
+from spatial import TileIndex
 from timer import Timer
 from math import sin
 from random import randint
@@ -7,7 +9,9 @@ import pygame
 DEBUG_INPUT = True  # set False kalau gak mau log input di console
 
 class Sprite(pygame.sprite.Sprite):
-    def __init__(self, pos, surf, groups):
+    pool = None
+
+    def __init__(self, pos, surf, groups, mask = None):
         # support groups as tuple/list or single group or None
         if isinstance(groups, (list, tuple)):
             super().__init__(*groups)
@@ -17,41 +21,81 @@ class Sprite(pygame.sprite.Sprite):
             super().__init__(groups)
         self.image = surf 
         self.rect = self.image.get_rect(topleft=pos)
-        # optional mask
+        # optional mask, made here unless the caller already has one
+        if mask is not None:
+            self.mask = mask
+            return
         try:
             self.mask = pygame.mask.from_surface(self.image)
         except Exception:
             self.mask = None
 
+    # pooled sprites go back to their pool when they leave the game
+    def kill(self):
+        if self.pool is not None and self.alive():
+            super().kill()
+            self.pool.release(self)
+        else:
+            super().kill()
+
+    def join(self, groups):
+        if isinstance(groups, (list, tuple)):
+            self.add(*groups)
+        elif groups is not None:
+            self.add(groups)
+
 class Bullet(Sprite):
-    def __init__(self, surf, pos, direction, groups):
-        super().__init__(pos, surf, groups)
-        if direction == -1:
-            self.image = pygame.transform.flip(self.image, True, False)
+    # bullets die once they are this far outside the camera
+    despawn_margin = 400
+
+    def __init__(self, surf, pos, direction, groups, camera = None):
+        # a SpriteSheet has the flipped image and both masks ready, a plain surface gets one made
+        self.sheet = surf if isinstance(surf, SpriteSheet) else SpriteSheet([surf])
+        image, mask = self.sheet.get(0, direction == -1)
+        super().__init__(pos, image, groups, mask)
         self.direction = direction
         self.speed = 850
+        self.camera = camera if camera is not None else pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT)
+
+    # a pooled bullet being fired again
+    def reset(self, pos, direction, groups, camera = None):
+        self.image, self.mask = self.sheet.get(0, direction == -1)
+        self.rect = self.image.get_rect(topleft = pos)
+        self.direction = direction
+        if camera is not None:
+            self.camera = camera
+        self.join(groups)
     
     def update(self, dt):
         self.rect.x += int(self.direction * self.speed * dt)
-        # kill if offscreen far away
-        if self.rect.right < -2000 or self.rect.left > WINDOW_WIDTH + 2000:
+        # kill once it's left the camera (world coordinates, like the rect)
+        if self.rect.right < self.camera.left - self.despawn_margin or self.rect.left > self.camera.right + self.despawn_margin:
             self.kill()
 
 class Fire(Sprite):
+    y_offset = pygame.Vector2(0, 8)
+
     def __init__(self, surf, pos, groups, player):
-        super().__init__(pos, surf, groups)
+        self.sheet = surf if isinstance(surf, SpriteSheet) else SpriteSheet([surf])
+        image, mask = self.sheet.get(0, player.flip)
+        super().__init__(pos, image, groups, mask)
+        self.timer = Timer(100, func=self.kill)
+        self.reset(pos, None, player)
+
+    # a pooled muzzle flash being shown again
+    def reset(self, pos, groups, player):
         self.player = player 
         self.flip = player.flip
-        self.timer = Timer(100, autostart=True, func=self.kill)
-        self.y_offset = pygame.Vector2(0, 8)
+        self.image, self.mask = self.sheet.get(0, self.flip)
+        self.rect = self.image.get_rect(topleft = pos)
+        self.timer.activate()
         if self.player.flip:
             self.rect.midright = self.player.rect.midleft + self.y_offset
-            self.image = pygame.transform.flip(self.image, True, False)
         else:
             self.rect.midleft = self.player.rect.midright + self.y_offset
+        self.join(groups)
 
     def update(self, _):
-        self.timer.update()
         if self.player.flip:
             self.rect.midright = self.player.rect.midleft + self.y_offset
         else:
@@ -61,21 +105,18 @@ class Fire(Sprite):
 
 class AnimatedSprite(Sprite):
     def __init__(self, frames, pos, groups):
-        self.frames = frames if frames else [pygame.Surface((32,32))]
+        # plain frame lists still work, they just get their masks made here
+        self.frames = frames if isinstance(frames, SpriteSheet) else SpriteSheet(frames)
         self.frame_index = 0
         self.animation_speed = 10
-        super().__init__(pos, self.frames[int(self.frame_index) % len(self.frames)], groups)
+        self.flip = False
+        image, mask = self.frames.get(self.frame_index)
+        super().__init__(pos, image, groups, mask)
 
     def animate(self, dt):
-        if not self.frames:
-            return
         self.frame_index += self.animation_speed * dt
-        self.image = self.frames[int(self.frame_index) % len(self.frames)]
-        # update mask after image change
-        try:
-            self.mask = pygame.mask.from_surface(self.image)
-        except Exception:
-            self.mask = None
+        # frames and masks are precomputed, just swap them
+        self.image, self.mask = self.frames.get(self.frame_index, self.flip)
 
 class Enemy(AnimatedSprite):
     def __init__(self, frames, pos, groups):
@@ -93,7 +134,6 @@ class Enemy(AnimatedSprite):
             pass
 
     def update(self, dt):
-        self.death_timer.update()
         if not self.death_timer:
             self.move(dt)
             self.animate(dt)
@@ -132,14 +172,14 @@ class Crab(Enemy):
     def constraint(self):
         if not self.main_rect.contains(self.rect):
             self.direction *= -1
-            # flip frames horizontally when turning
-            self.frames = [pygame.transform.flip(surf, True, False) for surf in self.frames]
+            # face the other way when turning, animate picks the flipped frames
+            self.flip = not self.flip
 
 # keep Worm name for compatibility but point to Crab
 Worm = Crab
 
 class Player(AnimatedSprite):
-    def __init__(self, pos, groups, collision_sprites, frames, create_bullet):
+    def __init__(self, pos, groups, collision_sprites, frames, create_bullet, tile_index = None):
         super().__init__(frames, pos, groups)
         self.flip = False
         self.create_bullet = create_bullet
@@ -147,6 +187,7 @@ class Player(AnimatedSprite):
         # movement & collision
         self.direction = pygame.Vector2()
         self.collision_sprites = collision_sprites
+        self.tile_index = tile_index if tile_index is not None else TileIndex(collision_sprites)
         self.speed = 400
         self.gravity = 1000  
         self.on_floor = False
@@ -187,25 +228,29 @@ class Player(AnimatedSprite):
         self.collision('vertical')
 
     def collision(self, direction):
-        for sprite in self.collision_sprites:
-            if sprite.rect.colliderect(self.rect):
-                if direction == 'horizontal':
-                    if self.direction.x > 0:
-                        self.rect.right = sprite.rect.left
-                    if self.direction.x < 0:
-                        self.rect.left = sprite.rect.right
-                if direction == 'vertical':
-                    if self.direction.y > 0:
-                        self.rect.bottom = sprite.rect.top
-                        self.on_floor = True
-                    if self.direction.y < 0:
-                        self.rect.top = sprite.rect.bottom
-                    self.direction.y = 0
+        # tiles come in the same order as collision_sprites, and after every push the next one
+        # is looked up around the moved rect, so it resolves exactly like a loop over all of them
+        index = self.tile_index.first_hit(self.rect)
+        while index is not None:
+            rect = self.tile_index.rects[index]
+            if direction == 'horizontal':
+                if self.direction.x > 0:
+                    self.rect.right = rect.left
+                if self.direction.x < 0:
+                    self.rect.left = rect.right
+            if direction == 'vertical':
+                if self.direction.y > 0:
+                    self.rect.bottom = rect.top
+                    self.on_floor = True
+                if self.direction.y < 0:
+                    self.rect.top = rect.bottom
+                self.direction.y = 0
+            index = self.tile_index.first_hit(self.rect, index)
 
     def check_floor(self):
         bottom_rect = pygame.Rect(0, 0, self.rect.width, 2)
         bottom_rect.midtop = self.rect.midbottom
-        self.on_floor = bottom_rect.collidelist([sprite.rect for sprite in self.collision_sprites]) >= 0
+        self.on_floor = self.tile_index.collides(bottom_rect)
 
     def animate(self, dt):
         if self.direction.x:
@@ -215,16 +260,9 @@ class Player(AnimatedSprite):
             self.frame_index = 0
 
         self.frame_index = 1 if not self.on_floor else self.frame_index
-        self.image = self.frames[int(self.frame_index) % len(self.frames)]
-        self.image = pygame.transform.flip(self.image, self.flip, False)
-        # update mask after flip
-        try:
-            self.mask = pygame.mask.from_surface(self.image)
-        except Exception:
-            self.mask = None
+        self.image, self.mask = self.frames.get(self.frame_index, self.flip)
 
     def update(self, dt):
-        self.shoot_timer.update()
         self.check_floor()
         self.input()
         self.move(dt)
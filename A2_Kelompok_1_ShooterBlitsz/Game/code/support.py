@@ -12,6 +12,31 @@ def import_folder(*path):
             frames.append(pygame.image.load(full_path).convert_alpha())
     return frames
 
+# animation frames with their flipped copies and masks made once at load time,
+# so sprites only swap references when the frame or facing changes
+class SpriteSheet:
+    def __init__(self, frames):
+        self.frames = list(frames) if frames else [pygame.Surface((32,32))]
+        self.flipped = [pygame.transform.flip(surf, True, False) for surf in self.frames]
+        self.masks = [pygame.mask.from_surface(surf) for surf in self.frames]
+        self.flipped_masks = [pygame.mask.from_surface(surf) for surf in self.flipped]
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __getitem__(self, index):
+        return self.frames[index]
+
+    # (image, mask) for a frame index, wraps around like the animations do
+    def get(self, index, flip = False):
+        index = int(index) % len(self.frames)
+        if flip:
+            return self.flipped[index], self.flipped_masks[index]
+        return self.frames[index], self.masks[index]
+
+def import_sheet(*path):
+    return SpriteSheet(import_folder(*path))
+
 def audio_importer(*path):
     audio_dict = {}
     for folder_path, _, file_names in walk(join(*path)):
@@ -1,4 +1,36 @@
 from settings import * 
+import heapq
+
+# one heap of deadlines for every active Timer, run once a frame from Game.run.
+# a frame where nothing is due costs a peek at the top of the heap, whatever the number of timers.
+# deactivating or restarting a timer bumps its generation, its old heap entry is then skipped when it comes up
+class Scheduler:
+    def __init__(self):
+        self.heap = []
+        self.count = 0      # tie breaker, timers due on the same tick fire in the order they were started
+        self.fired = 0      # timers fired by the last update
+
+    def schedule(self, timer, deadline):
+        self.count += 1
+        heapq.heappush(self.heap, (deadline, self.count, timer, timer.generation))
+
+    def update(self, now = None):
+        now = pygame.time.get_ticks() if now is None else now
+        self.fired = 0
+        while self.heap and self.heap[0][0] <= now:
+            _, _, timer, generation = heapq.heappop(self.heap)
+            if timer.active and generation == timer.generation:
+                self.fired += 1
+                timer.fire()
+
+    # drops every pending timer, for when the game starts over
+    def clear(self):
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+scheduler = Scheduler()
 
 class Timer:
     def __init__(self, duration, func = None, repeat = None, autostart = False):
@@ -7,6 +39,7 @@ class Timer:
         self.active = False
         self.func = func
         self.repeat = repeat
+        self.generation = 0
 
         if autostart:
             self.activate()
@@ -17,15 +50,22 @@ class Timer:
     def activate(self):
         self.active = True
         self.start_time = pygame.time.get_ticks()
+        self.generation += 1
+        scheduler.schedule(self, self.start_time + self.duration)
 
     def deactivate(self):
         self.active = False
         self.start_time = 0
+        self.generation += 1
         if self.repeat:
             self.activate()
 
+    # called by the scheduler when the duration is up
+    def fire(self):
+        if self.func:
+            self.func()
+        self.deactivate()
+
+    # the scheduler fires timers now, kept so older code calling it still works
     def update(self):
-        if pygame.time.get_ticks() - self.start_time >= self.duration:
-            if self.func and self.start_time != 0:
-                self.func()
-            self.deactivate()
\ No newline at end of file
+        pass
\ No newline at end of file